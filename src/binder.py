@@ -0,0 +1,30 @@
+import inspect
+import threading
+import weakref
+from typing import Any, Callable, Dict, Tuple
+
+
+class Binder:
+    def __init__(self, func: Callable):
+        params = inspect.signature(func).parameters
+        self.names: Tuple[str, ...] = tuple(params.keys())
+        self.defaults: Dict[str, Any] = {
+            key: param.default
+            for key, param in params.items()
+            if param.default is not inspect.Parameter.empty
+        }
+
+
+_binders: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+_lock = threading.Lock()
+
+
+def getBinder(func: Callable) -> Binder:
+    binder = _binders.get(func)
+
+    if binder is None:
+        binder = Binder(func)
+        with _lock:
+            _binders[func] = binder
+
+    return binder
@@ -0,0 +1,21 @@
+from typing import Any, Callable, Dict, List, Tuple
+
+from src.validation.validation_error import renderTotalErrors
+
+
+class ChildResult:
+    def __init__(
+        self,
+        totalErrors: Dict[str, Any],
+        deferCallbacks: List[Tuple[Callable, List[Any]]],
+        hasCallbacks: bool,
+    ):
+        self.deferCallbacks = deferCallbacks
+        self.hasCallbacks = hasCallbacks
+        self.totalErrors = totalErrors
+
+    def getTotalErrors(self) -> Dict[str, Any]:
+        return renderTotalErrors(self.totalErrors)
+
+    def hasTotalErrors(self) -> bool:
+        return bool(self.totalErrors)
@@ -0,0 +1,61 @@
+from functools import lru_cache
+from typing import Any, List, Tuple
+
+MISSING = object()
+
+
+class CompiledPath:
+    def __init__(self, key: str):
+        self.key = key
+        self.segs: Tuple[str, ...] = tuple(key.split("."))
+        self.prefixes: Tuple[str, ...] = tuple(
+            ".".join(self.segs[0 : i + 1]) for i in range(len(self.segs))
+        )
+        self.wildcardIndex = self.segs.index("*") if "*" in self.segs else -1
+
+    @staticmethod
+    def step(value: Any, seg: str) -> Any:
+        if isinstance(value, dict):
+            return value.get(seg, MISSING)
+
+        if isinstance(value, list) and seg.isdigit() and int(seg) < len(value):
+            return value[int(seg)]
+
+        return MISSING
+
+    def expand(self, data: Any) -> List[str]:
+        if self.wildcardIndex == -1:
+            return [self.key]
+
+        value = data
+        for seg in self.segs[0 : self.wildcardIndex]:
+            value = self.step(value, seg)
+
+        if isinstance(value, dict):
+            subKeys = [str(k) for k in value.keys()]
+        elif isinstance(value, list):
+            subKeys = [str(i) for i in range(len(value))]
+        else:
+            return []
+
+        head = self.segs[0 : self.wildcardIndex]
+        tail = self.segs[self.wildcardIndex + 1 :]
+
+        return [".".join([*head, subKey, *tail]) for subKey in subKeys]
+
+    def get(self, data: Any, default: Any = None) -> Any:
+        value = data
+        for seg in self.segs:
+            value = self.step(value, seg)
+            if value is MISSING:
+                return default
+
+        return value
+
+    def has(self, data: Any) -> bool:
+        return self.get(data, MISSING) is not MISSING
+
+
+@lru_cache(maxsize=4096)
+def getCompiledPath(key: str) -> CompiledPath:
+    return CompiledPath(key)
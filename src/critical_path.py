@@ -0,0 +1,163 @@
+import json
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, List
+
+
+class TimingProfiler:
+    def __init__(self):
+        self.timings: Dict[str, float] = {}
+        self.__serviceDepth = 0
+
+    @contextmanager
+    def measure(self, kind: str, name: str):
+        if "service" == kind:
+            self.__serviceDepth += 1
+
+        startedAt = time.perf_counter()
+
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - startedAt
+
+            if "service" == kind:
+                self.__serviceDepth -= 1
+            elif 1 == self.__serviceDepth:
+                key = name.split(".")[0]
+                self.timings[key] = self.timings.get(key, 0) + elapsed
+
+    def profile(self, service):
+        service.setProfiler(self)
+
+        return service.run()
+
+
+class CriticalPathReport:
+    def __init__(
+        self,
+        criticalPath: List[str],
+        criticalPathTime: float,
+        sequentialTime: float,
+        loaders: Dict[str, Dict[str, float]],
+    ):
+        self.criticalPath = criticalPath
+        self.criticalPathTime = criticalPathTime
+        self.sequentialTime = sequentialTime
+        self.loaders = loaders
+
+    def toDict(self) -> Dict[str, Any]:
+        return {
+            "criticalPath": self.criticalPath,
+            "criticalPathTime": self.criticalPathTime,
+            "sequentialTime": self.sequentialTime,
+            "parallelSpeedup": self.__getSpeedup(self.criticalPathTime),
+            "loaders": self.loaders,
+        }
+
+    def toJson(self) -> str:
+        return json.dumps(self.toDict(), indent=2)
+
+    def toText(self) -> str:
+        lines = [
+            "critical path: " + " -> ".join(self.criticalPath),
+            "critical path time: " + format(self.criticalPathTime, ".6f") + "s",
+            "sequential time: " + format(self.sequentialTime, ".6f") + "s",
+            "parallel speedup: "
+            + format(self.__getSpeedup(self.criticalPathTime), ".2f")
+            + "x",
+        ]
+
+        for key, loader in self.loaders.items():
+            lines.append(
+                "  "
+                + key
+                + ": time="
+                + format(loader["time"], ".6f")
+                + "s slack="
+                + format(loader["slack"], ".6f")
+                + "s ifCached="
+                + format(loader["ifCachedSpeedup"], ".2f")
+                + "x ifAsync="
+                + format(loader["ifAsyncSpeedup"], ".2f")
+                + "x"
+            )
+
+        return "\n".join(lines)
+
+    def __getSpeedup(self, time: float) -> float:
+        return self.sequentialTime / time if time > 0 else 1.0
+
+
+def analyzeCriticalPath(
+    graph: Dict[str, List[str]], timings: Dict[str, float]
+) -> CriticalPathReport:
+    keys = [*graph.keys()]
+    for deps in graph.values():
+        keys.extend(dep for dep in deps if dep not in graph)
+    keys = [*dict.fromkeys(keys)]
+
+    durations = {key: timings.get(key, 0.0) for key in keys}
+    dependents: Dict[str, List[str]] = {key: [] for key in keys}
+    for key, deps in graph.items():
+        for dep in deps:
+            dependents[dep].append(key)
+
+    orderedKeys = []
+    visited = set()
+
+    for key in keys:
+        stack = [(key, False)]
+        while stack:
+            current, isExpanded = stack.pop()
+            if isExpanded:
+                orderedKeys.append(current)
+                continue
+            if current in visited:
+                continue
+            visited.add(current)
+            stack.append((current, True))
+            for dep in graph.get(current, []):
+                if dep not in visited:
+                    stack.append((dep, False))
+
+    finishes: Dict[str, float] = {}
+    for key in orderedKeys:
+        start = max([finishes[dep] for dep in graph.get(key, [])] + [0.0])
+        finishes[key] = start + durations[key]
+
+    tails: Dict[str, float] = {}
+    for key in reversed(orderedKeys):
+        tails[key] = max(
+            [durations[dependent] + tails[dependent] for dependent in dependents[key]]
+            + [0.0]
+        )
+
+    criticalPathTime = max(finishes.values()) if finishes else 0.0
+    sequentialTime = sum(durations.values())
+    criticalPath = []
+    key = max(finishes, key=lambda k: finishes[k]) if finishes else None
+
+    while key is not None:
+        criticalPath.insert(0, key)
+        deps = graph.get(key, [])
+        key = max(deps, key=lambda k: finishes[k]) if deps else None
+
+    loaders = {}
+    for key in keys:
+        if key not in timings:
+            continue
+
+        duration = durations[key]
+        slack = criticalPathTime - (finishes[key] + tails[key])
+        asyncTime = max(sequentialTime - duration, finishes[key] + tails[key])
+        cachedTime = sequentialTime - duration
+
+        loaders[key] = {
+            "time": duration,
+            "slack": slack,
+            "ifCachedSpeedup": sequentialTime / cachedTime if cachedTime > 0 else 1.0,
+            "ifAsyncSpeedup": sequentialTime / asyncTime if asyncTime > 0 else 1.0,
+        }
+
+    return CriticalPathReport(criticalPath, criticalPathTime, sequentialTime, loaders)
@@ -0,0 +1,64 @@
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Callable, Set
+
+logger = logging.getLogger(__name__)
+
+
+class DeferExecutor:
+    def __init__(
+        self,
+        maxWorkers: int = 1,
+        maxQueueSize: int = 1000,
+        onError: Callable[[Exception, Callable], None] | None = None,
+    ):
+        self.onError = onError
+        self.__executor = ThreadPoolExecutor(
+            max_workers=maxWorkers, thread_name_prefix="defer"
+        )
+        self.__futures: Set[Future] = set()
+        self.__lock = threading.Lock()
+        self.__slots = threading.BoundedSemaphore(maxQueueSize)
+
+    def flush(self, timeout: float | None = None) -> bool:
+        with self.__lock:
+            futures = set(self.__futures)
+
+        notDone = wait(futures, timeout=timeout).not_done
+
+        return not notDone
+
+    def shutdown(self, wait: bool = True):
+        self.__executor.shutdown(wait=wait)
+
+    def submit(self, callback: Callable, *args) -> Future:
+        self.__slots.acquire()
+
+        try:
+            future = self.__executor.submit(self.__run, callback, args)
+        except Exception:
+            self.__slots.release()
+            raise
+
+        with self.__lock:
+            self.__futures.add(future)
+
+        future.add_done_callback(self.__done)
+
+        return future
+
+    def __done(self, future: Future):
+        with self.__lock:
+            self.__futures.discard(future)
+
+    def __run(self, callback: Callable, args):
+        try:
+            callback(*args)
+        except Exception as e:
+            if self.onError:
+                self.onError(e, callback)
+            else:
+                logger.exception("deferred callback %s failed", callback.__name__)
+        finally:
+            self.__slots.release()
@@ -0,0 +1,33 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Callable
+
+
+class IdentityCache:
+    def __init__(self, maxSize: int = 1024):
+        self.maxSize = maxSize
+        self.__items: OrderedDict = OrderedDict()
+        self.__lock = threading.Lock()
+
+    def get(self, key: Any, factory: Callable[[Any], Any]) -> Any:
+        with self.__lock:
+            item = self.__items.get(id(key))
+
+            if item is not None and item[0] is key:
+                self.__items.move_to_end(id(key))
+                return item[1]
+
+        value = factory(key)
+
+        with self.__lock:
+            self.__items[id(key)] = (key, value)
+            self.__items.move_to_end(id(key))
+
+            while len(self.__items) > self.maxSize:
+                self.__items.popitem(last=False)
+
+        return value
+
+    def size(self) -> int:
+        with self.__lock:
+            return len(self.__items)
@@ -0,0 +1,266 @@
+import argparse
+import json
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Dict, List, Tuple, Type
+
+from src.service import Service
+
+PERCENTILES = {"p50": 50, "p95": 95, "p99": 99, "p999": 99.9}
+
+
+class StandInUserService(Service):
+    def getBindNames():
+        return {"latency": "latency", "user": "user[...]"}
+
+    def getLoaders():
+        def user(latency):
+            import time
+
+            time.sleep(latency)
+            return {"id": 1, "name": "user"}
+
+        def profile(user, latency):
+            import time
+
+            time.sleep(latency)
+            return {"userId": user["id"], "bio": "bio"}
+
+        def result(user, profile):
+            return {**user, "profile": profile}
+
+    def getRuleLists():
+        return {
+            "latency": {"properties": {"latency": {"type": "number", "minimum": 0}}},
+            "user": {"properties": {"user": {"type": "object", "required": ["id"]}}},
+        }
+
+
+class StandInPostService(Service):
+    def getBindNames():
+        return {"latency": "latency"}
+
+    def getLoaders():
+        def result(latency):
+            import time
+
+            time.sleep(latency)
+            return {"title": "post"}
+
+
+class StandInFeedService(Service):
+    def __init__(self) -> None:
+        super().__init__()
+        self.postService = StandInPostService
+
+    def getBindNames():
+        return {"latency": "latency", "size": "size"}
+
+    def getLoaders():
+        def result(postService, latency, size):
+            return [[postService, {"latency": latency}] for _ in range(size)]
+
+
+def getStandInCatalog(latency: float = 0.002) -> Dict[str, Tuple[Type, Dict]]:
+    return {
+        "user": (StandInUserService, {"latency": latency}),
+        "feed": (StandInFeedService, {"latency": latency, "size": 5}),
+    }
+
+
+def getPercentile(sortedValues: List[float], percentile: float) -> float:
+    if not sortedValues:
+        return 0.0
+
+    index = int(len(sortedValues) * percentile / 100)
+
+    return sortedValues[min(index, len(sortedValues) - 1)]
+
+
+def getLatencyStats(latencies: List[float], elapsed: float) -> Dict[str, Any]:
+    sortedValues = sorted(latencies)
+    stats: Dict[str, Any] = {
+        "count": len(sortedValues),
+        "throughput": len(sortedValues) / elapsed if elapsed > 0 else 0.0,
+    }
+
+    for key, percentile in PERCENTILES.items():
+        stats[key] = getPercentile(sortedValues, percentile)
+
+    return stats
+
+
+def _runWorker(cls: Type, inputs: Dict[str, Any], iterations: int) -> List[float]:
+    latencies = []
+    cls().setWith({**inputs}).run()
+
+    for _ in range(iterations):
+        startedAt = time.perf_counter()
+        service = cls().setWith({**inputs})
+        service.run()
+        latencies.append(time.perf_counter() - startedAt)
+
+        if service.hasTotalErrors():
+            raise Exception(
+                json.dumps(service.getTotalErrors()) + " in " + cls.__name__
+            )
+
+    return latencies
+
+
+class LoadTestReport:
+    def __init__(self, services: Dict[str, Dict[str, Any]]):
+        self.services = services
+
+    def compare(self, baseline: Dict[str, Any], tolerance: float = 0.2) -> List[str]:
+        regressions = []
+
+        for name, base in baseline.get("services", {}).items():
+            if name not in self.services:
+                continue
+
+            current = self.services[name]
+
+            for key in PERCENTILES.keys():
+                if key in base and current[key] > base[key] * (1 + tolerance):
+                    regressions.append(
+                        name
+                        + " "
+                        + key
+                        + " "
+                        + format(current[key], ".6f")
+                        + "s > baseline "
+                        + format(base[key], ".6f")
+                        + "s"
+                    )
+
+            if "throughput" in base and current["throughput"] < base["throughput"] / (
+                1 + tolerance
+            ):
+                regressions.append(
+                    name
+                    + " throughput "
+                    + format(current["throughput"], ".2f")
+                    + "/s < baseline "
+                    + format(base["throughput"], ".2f")
+                    + "/s"
+                )
+
+        return regressions
+
+    def toDict(self) -> Dict[str, Any]:
+        return {"services": self.services}
+
+    def toJson(self) -> str:
+        return json.dumps(self.toDict(), indent=2)
+
+    def toText(self) -> str:
+        lines = []
+
+        for name, stats in self.services.items():
+            lines.append(
+                name
+                + ": count="
+                + str(stats["count"])
+                + " throughput="
+                + format(stats["throughput"], ".2f")
+                + "/s "
+                + " ".join(
+                    key + "=" + format(stats[key] * 1000, ".3f") + "ms"
+                    for key in PERCENTILES.keys()
+                )
+            )
+
+        return "\n".join(lines)
+
+
+class LoadTest:
+    MODES = ["thread", "process"]
+
+    def __init__(
+        self,
+        catalog: Dict[str, Tuple[Type, Dict]],
+        concurrency: int = 8,
+        requests: int = 200,
+        mode: str = "thread",
+    ):
+        if mode not in self.MODES:
+            raise Exception("unsupported mode [" + mode + "] in LoadTest")
+
+        self.catalog = catalog
+        self.concurrency = concurrency
+        self.requests = requests
+        self.mode = mode
+
+    def run(self) -> LoadTestReport:
+        services = {}
+
+        for name, (cls, inputs) in self.catalog.items():
+            services[name] = self.__runService(cls, inputs)
+
+        return LoadTestReport(services)
+
+    def __runService(self, cls: Type, inputs: Dict[str, Any]) -> Dict[str, Any]:
+        executorClass = (
+            ThreadPoolExecutor if "thread" == self.mode else ProcessPoolExecutor
+        )
+        iterations = [
+            self.requests // self.concurrency
+            + (1 if i < self.requests % self.concurrency else 0)
+            for i in range(self.concurrency)
+        ]
+        latencies = []
+
+        with executorClass(self.concurrency) as executor:
+            startedAt = time.perf_counter()
+            futures = [
+                executor.submit(_runWorker, cls, inputs, n) for n in iterations if n
+            ]
+            for future in futures:
+                latencies.extend(future.result())
+            elapsed = time.perf_counter() - startedAt
+
+        return getLatencyStats(latencies, elapsed)
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m src.load_test")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--mode", choices=LoadTest.MODES, default="thread")
+    parser.add_argument("--latency", type=float, default=0.002)
+    parser.add_argument("--baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    parser.add_argument("--write-baseline")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args(argv)
+
+    report = LoadTest(
+        getStandInCatalog(args.latency),
+        args.concurrency,
+        args.requests,
+        args.mode,
+    ).run()
+
+    print(report.toJson() if args.json else report.toText())
+
+    if args.write_baseline:
+        with open(args.write_baseline, "w") as fp:
+            fp.write(report.toJson())
+
+    if args.baseline:
+        with open(args.baseline) as fp:
+            regressions = report.compare(json.load(fp), args.tolerance)
+
+        for regression in regressions:
+            print("regression: " + regression, file=sys.stderr)
+
+        if regressions:
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,124 @@
+import tracemalloc
+from contextlib import contextmanager
+from typing import Any, Dict, List
+
+
+class MemoryProfileNode:
+    def __init__(self, kind: str, name: str):
+        self.kind = kind
+        self.name = name
+        self.net = 0
+        self.peak = 0
+        self.childs: List[MemoryProfileNode] = []
+
+    def toDict(self) -> Dict[str, Any]:
+        return {
+            "kind": self.kind,
+            "name": self.name,
+            "net": self.net,
+            "peak": self.peak,
+            "childs": [child.toDict() for child in self.childs],
+        }
+
+
+class MemoryProfiler:
+    def __init__(self, topSiteCount: int = 10):
+        self.topSiteCount = topSiteCount
+        self.root = MemoryProfileNode("root", "root")
+        self.topSites: List[tracemalloc.StatisticDiff] = []
+        self.__stack: List[List[Any]] = []
+
+    @contextmanager
+    def measure(self, kind: str, name: str):
+        node = MemoryProfileNode(kind, name)
+        parent = self.__stack[-1] if self.__stack else None
+        current, peak = tracemalloc.get_traced_memory()
+
+        if parent:
+            parent[0].childs.append(node)
+            parent[2] = max(parent[2], peak)
+        else:
+            self.root.childs.append(node)
+
+        tracemalloc.reset_peak()
+        frame = [node, current, current]
+        self.__stack.append(frame)
+
+        try:
+            yield node
+        finally:
+            current, peak = tracemalloc.get_traced_memory()
+            self.__stack.pop()
+            frame[2] = max(frame[2], peak)
+            node.net = current - frame[1]
+            node.peak = frame[2] - frame[1]
+
+            if parent:
+                parent[2] = max(parent[2], frame[2])
+
+            tracemalloc.reset_peak()
+
+    def profile(self, service):
+        isTracing = tracemalloc.is_tracing()
+
+        if not isTracing:
+            tracemalloc.start()
+
+        try:
+            before = self.__takeSnapshot()
+            service.setProfiler(self)
+            response = service.run()
+            after = self.__takeSnapshot()
+        finally:
+            if not isTracing:
+                tracemalloc.stop()
+
+        self.topSites = after.compare_to(before, "lineno")[: self.topSiteCount]
+
+        return response
+
+    def getReport(self) -> Dict[str, Any]:
+        return {
+            "tree": [child.toDict() for child in self.root.childs],
+            "topSites": [
+                {
+                    "site": str(stat.traceback[0]),
+                    "sizeDiff": stat.size_diff,
+                    "countDiff": stat.count_diff,
+                }
+                for stat in self.topSites
+            ],
+        }
+
+    def formatReport(self) -> str:
+        lines = []
+
+        def formatNode(node: MemoryProfileNode, indent: int):
+            lines.append(
+                "  " * indent
+                + node.kind
+                + " "
+                + node.name
+                + ": peak="
+                + str(node.peak)
+                + "B net="
+                + str(node.net)
+                + "B"
+            )
+            for child in node.childs:
+                formatNode(child, indent + 1)
+
+        for child in self.root.childs:
+            formatNode(child, 0)
+
+        lines.append("top allocation sites:")
+
+        for stat in self.topSites:
+            lines.append("  " + str(stat))
+
+        return "\n".join(lines)
+
+    def __takeSnapshot(self):
+        return tracemalloc.take_snapshot().filter_traces(
+            [tracemalloc.Filter(False, tracemalloc.__file__)]
+        )
@@ -0,0 +1,45 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+
+class ResultCache:
+    def __init__(self, maxSize: int = 128, ttl: float | None = None):
+        self.maxSize = maxSize
+        self.ttl = ttl
+        self.__items: OrderedDict = OrderedDict()
+        self.__lock = threading.Lock()
+
+    def clear(self):
+        with self.__lock:
+            self.__items.clear()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        with self.__lock:
+            if key not in self.__items:
+                return default
+
+            expiresAt, value = self.__items[key]
+
+            if expiresAt is not None and expiresAt <= time.monotonic():
+                del self.__items[key]
+                return default
+
+            self.__items.move_to_end(key)
+
+            return value
+
+    def set(self, key: str, value: Any):
+        expiresAt = time.monotonic() + self.ttl if self.ttl is not None else None
+
+        with self.__lock:
+            self.__items[key] = (expiresAt, value)
+            self.__items.move_to_end(key)
+
+            while len(self.__items) > self.maxSize:
+                self.__items.popitem(last=False)
+
+    def size(self) -> int:
+        with self.__lock:
+            return len(self.__items)
@@ -1,139 +1,140 @@
 import copy
-import re
+import json
+from functools import lru_cache
+from typing import Callable
 
+from src.compiled_path import getCompiledPath
+from src.identity_cache import IdentityCache
 from src.service_base import ServiceBase
+from src.validation.rule_template import getRuleTemplate
+from src.validation.validation_error import ValidationError
 from src.validation.validator import getValidator
 
 
+def getPresentRelatedRule(rule):
+    hasPresentRule = False
+
+    def removeNotPresentRules(rule: dict):
+        nonlocal hasPresentRule
+
+        for x in [*rule.keys()]:
+            if x == "required":
+                hasPresentRule = True
+            if x not in [
+                "required",
+                "properties",
+                "dependentRequired",
+                "allOf",
+                "anyOf",
+                "oneOf",
+                "if",
+                "then",
+                "else",
+            ]:
+                del rule[x]
+
+        if "properties" in rule.keys():
+            for x, v in rule["properties"].items():
+                rule["properties"][x] = removeNotPresentRules(v)
+
+        for x in ["allOf", "anyOf", "oneOf"]:
+            if x in rule:
+                for xx, vv in enumerate(rule[x]):
+                    rule[x][xx] = removeNotPresentRules(vv)
+
+        for x in ["then", "else"]:
+            if x in rule:
+                rule[x] = removeNotPresentRules(rule[x])
+
+        return rule
+
+    removeNotPresentRules(rule)
+
+    if hasPresentRule:
+        return rule
+
+    return None
+
+
+@lru_cache(maxsize=1024)
+def compilePresentRelatedRule(fingerprint: str):
+    return getPresentRelatedRule(json.loads(fingerprint))
+
+
+def _filterPresentRelatedRule(rule):
+    try:
+        fingerprint = json.dumps(rule, sort_keys=True)
+    except (TypeError, ValueError):
+        return getPresentRelatedRule(copy.deepcopy(rule))
+
+    return compilePresentRelatedRule(fingerprint)
+
+
+_presentRelatedRules = IdentityCache()
+
+
 class Service(ServiceBase):
 
     @staticmethod
     def filterPresentRelatedRule(rule):
-        rule = copy.deepcopy(rule)
-        hasPresentRule = False
-
-        def removeNotPresentRules(rule: dict):
-            nonlocal hasPresentRule
-
-            for x in [*rule.keys()]:
-                if x == "required":
-                    hasPresentRule = True
-                if x not in [
-                    "required",
-                    "properties",
-                    "dependentRequired",
-                    "allOf",
-                    "anyOf",
-                    "oneOf",
-                    "if",
-                    "then",
-                    "else",
-                ]:
-                    del rule[x]
-
-            if "properties" in rule.keys():
-                for x, v in rule["properties"].items():
-                    rule["properties"][x] = removeNotPresentRules(v)
-
-            for x in ["allOf", "anyOf", "oneOf"]:
-                if x in rule:
-                    for xx, vv in enumerate(rule[x]):
-                        rule[x][xx] = removeNotPresentRules(vv)
-
-            for x in ["then", "else"]:
-                if x in rule:
-                    rule[x] = removeNotPresentRules(rule[x])
-
-            return rule
-
-        removeNotPresentRules(rule)
-
-        if hasPresentRule:
-            return rule
-
-        return None
+        return _presentRelatedRules.get(rule, _filterPresentRelatedRule)
 
     @staticmethod
     def getDependencyKeysInRule(rule):
-        deps = []
-
-        def findDependencies(obj, deps: list):
-            for k, v in obj.items():
-                if type(v) == dict:
-                    findDependencies(v, deps)
-                elif type(v) == str:
-                    for x in [*re.finditer(r"\{\{\s*(.+)\s*\}\}", v)]:
-                        deps.append(x[1])
-                elif type(v) == list:
-                    for vv in v:
-                        for x in [*re.finditer(r"\{\{\s*(.+)\s*\}\}", vv)]:
-                            deps.append(x[1])
-            return deps
-
-        return findDependencies(rule, deps)
+        return [*getRuleTemplate(rule).deps]
 
     @staticmethod
     def getValidationErrorTemplateMessages():
-        return {"required": "'{property}' is required"}
+        return {
+            "required": "'{property}' is required",
+            "timeout": "'{property}' is timed out",
+        }
 
     @staticmethod
-    def getValidationErrors(data: dict, ruleLists: dict, names: dict, messages: dict):
+    def getValidationErrors(
+        data: dict,
+        ruleLists: dict,
+        names: dict | Callable[[str], str],
+        messages: dict,
+        deps: dict | None = None,
+    ):
         errors = {}
 
-        def replaceDependencies(obj, deps: list):
-            for k, v in obj.items():
-                if type(v) == dict:
-                    replaceDependencies(v, deps)
-                elif type(v) == str:
-                    obj[k] = re.sub(
-                        r"\{\{\s*(.+)\s*\}\}",
-                        r"\1",
-                    )
-                elif type(v) == list:
-                    for vv in v:
-                        replaceDependencies(vv, deps)
-
         for k, ruleList in ruleLists.items():
             for rule in ruleList:
+                template = getRuleTemplate(rule)
+                rule = template.render(deps or {})
                 for error in getValidator(rule).iter_errors(data):
                     if k not in errors:
                         errors[k] = []
-                    requiredMsgMatch = re.match(
-                        "'(.+)' is a required property",
-                        error.message,
-                    )
-                    if requiredMsgMatch:
-                        mainKey = [*error.path, requiredMsgMatch[1]][0]
-                        subKey = "][".join([*error.path, requiredMsgMatch[1]][1:])
-                        name = re.sub(
-                            r"\[\.\.\.\]",
-                            "[" + subKey + "]" if subKey else "",
-                            names[mainKey],
+                    errors[k].append(
+                        ValidationError(
+                            error.validator,
+                            [*error.path],
+                            k,
+                            error.message,
+                            names,
+                            messages,
                         )
-                        error.message = re.sub(
-                            r"\{property\}",
-                            name,
-                            messages["required"],
-                        )
-                    errors[k].append(error.message)
+                    )
 
         return errors
 
     @staticmethod
     def hasArrayObjectRuleInRuleList(ruleList, key):
         has = False
+        segs = getCompiledPath(key).segs
         for rule in ruleList:
-            keySegs = key.split(".")
             value = rule
-            while keySegs:
-                seg = keySegs.pop(0)
+            for i, seg in enumerate(segs):
+                isLastSeg = i == len(segs) - 1
                 if "properties" not in value:
                     break
                 if seg not in value["properties"]:
                     break
-                if not keySegs and "type" not in value["properties"][seg]:
+                if isLastSeg and "type" not in value["properties"][seg]:
                     break
-                if not keySegs and value["properties"][seg]["type"] == "object":
+                if isLastSeg and value["properties"][seg]["type"] == "object":
                     has = True
                 value = value["properties"][seg]
         return has
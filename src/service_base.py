@@ -1,29 +1,90 @@
 import ast
+import contextlib
 import copy
+import hashlib
 import inspect
 import json
 import os
+import pickle
 import re
+import threading
+import time
 import types
+import weakref
 from abc import ABC, abstractmethod
+from collections import deque
+from concurrent.futures import (
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    FIRST_COMPLETED,
+    ThreadPoolExecutor,
+    TimeoutError,
+    wait,
+)
+from contextvars import ContextVar, copy_context
 from importlib.machinery import SourceFileLoader
-from typing import Any, Callable, Dict, List, Type
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Set, Type
 
 from typing_extensions import Self
 
+from src.binder import getBinder
+from src.child_result import ChildResult
+from src.compiled_path import MISSING, CompiledPath, getCompiledPath
+from src.validation.validation_error import ValidationError, renderTotalErrors
+
+
+def _runLoaderInProcess(cls, key, args):
+    return cls.getAllLoaders()[key](*args)
+
 
 class ServiceBase(ABC):
     BIND_NAME_EXP = r"\{\{([a-zA-Z][\w\.\*]+)\}\}"
-    __onFailCallbacks: List[Callable] = []
-    __onStartCallbacks: List[Callable] = []
-    __onSuccessCallbacks: List[Callable] = []
-    __childs: Dict[str, Type[Self]] = {}
+    DEFER_CALLBACK_EXP = r"(@|__)defer$"
+    HEDGE_MIN_SAMPLES = 20
+    MAX_CHILDS_IN_FLIGHT = 0
+    POOL_SIZE = 0
+    __cacheLock = threading.Lock()
+    __latencyHistory: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+    __lifecycleCallbacks: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+    __lifecycleLock = threading.Lock()
+    __scopedLifecycleCallbacks: ContextVar = ContextVar(
+        "scopedLifecycleCallbacks", default=()
+    )
+    __abortedKeys: Set[str] = set()
+    __changedKeys: Set[str] = set()
+    __childs: Dict[str, Self | ChildResult] = {}
     __data: Dict[str, Any] = {}
+    __deadline: float | None = None
+    __definedFunctions: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+    __deferExecutor: Any = None
     __errors: Dict[str, List[str]] = {}
+    __futures: Dict[str, Future] = {}
+    __hasCallbacks: bool = False
     __inputs: Dict[str, Any] = {}
+    __isAborted: bool = False
+    __isFailFast: bool = False
+    __isLazy: bool = False
+    __isPoolable: bool = False
+    __isPrefetching: bool = False
     __isRun: bool = False
+    __isStreaming: bool = False
+    __loaderStats: Dict[str, Dict[str, Any]] = {}
     __names: Dict[str, str] = {}
     __parent: Self | None = None
+    __poolLock = threading.Lock()
+    __pools: Dict[Type[Self], List[Self]] = {}
+    __processPoolExecutor: Executor | None = None
+    __propNames: Set[str] | None = None
+    __serviceClasses: weakref.WeakSet = weakref.WeakSet()
+    __traits: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+    __profiler: Any = None
+    __resultCache: Any = None
+    __ruleLists: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+    __stream: Iterable | None = None
+    __threadPoolExecutor: Executor | None = None
+    __timedOutKeys: Set[str] = set()
+    __totalErrors: Dict[str, Any] = {}
     __validations: Dict[str, bool] = {}
 
     @staticmethod
@@ -43,7 +104,7 @@ class ServiceBase(ABC):
 
     @staticmethod
     @abstractmethod
-    def getValidationErrors(data, ruleLists, names, messages):
+    def getValidationErrors(data, ruleLists, names, messages, deps=None):
         pass
 
     @staticmethod
@@ -56,8 +117,30 @@ class ServiceBase(ABC):
     def getResponseBody(result, totalErrors):
         pass
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        ServiceBase.__serviceClasses.add(cls)
+
     @classmethod
     def __get_defined_functions(self, method):
+        definedFunctions = ServiceBase.__definedFunctions.get(self, {})
+
+        if method not in definedFunctions:
+            with ServiceBase.__cacheLock:
+                definedFunctions = ServiceBase.__definedFunctions.setdefault(self, {})
+                if method not in definedFunctions:
+                    definedFunctions[method] = self.__load_defined_functions(method)
+
+        return definedFunctions[method]
+
+    @classmethod
+    def __addLifecycleCallback(self, event, callback):
+        with ServiceBase.__lifecycleLock:
+            callbacks = ServiceBase.__lifecycleCallbacks.setdefault(self, {})
+            callbacks[event] = [*callbacks.get(event, []), callback]
+
+    @classmethod
+    def __load_defined_functions(self, method):
         filepath = os.path.abspath(inspect.getfile(self))
         module_loader = SourceFileLoader("service_module", filepath)
         module = module_loader.exec_module(types.ModuleType(module_loader.name))
@@ -85,17 +168,55 @@ class ServiceBase(ABC):
 
         return namespace
 
+    @staticmethod
+    def __trampoline(generator):
+        stack = [generator]
+        value = None
+        error = None
+
+        while stack:
+            try:
+                if error is None:
+                    step = stack[-1].send(value)
+                else:
+                    step = stack[-1].throw(error)
+                    error = None
+            except StopIteration as e:
+                stack.pop()
+                value = e.value
+                continue
+            except BaseException as e:
+                stack.pop()
+                if not stack:
+                    raise
+                error = e
+                continue
+
+            stack.append(step)
+            value = None
+
+        return value
+
+    @classmethod
+    def acquire(self):
+        with ServiceBase.__poolLock:
+            pool = ServiceBase.__pools.get(self, [])
+            if pool:
+                return pool.pop()
+
+        return self()
+
     @classmethod
     def addOnFailCallback(self, callback):
-        self.__onFailCallbacks.append(callback)
+        self.__addLifecycleCallback("fail", callback)
 
     @classmethod
     def addOnStartCallback(self, callback):
-        self.__onStartCallbacks.append(callback)
+        self.__addLifecycleCallback("start", callback)
 
     @classmethod
     def addOnSuccessCallback(self, callback):
-        self.__onSuccessCallbacks.append(callback)
+        self.__addLifecycleCallback("success", callback)
 
     @classmethod
     def getAllBindNames(self):
@@ -117,43 +238,45 @@ class ServiceBase(ABC):
     @classmethod
     def getAllCallbacks(self):
         arr = {}
-        for cls in self.getTraits():
-            for key, callback in cls.getAllCallbacks().items():
-                if key in arr.keys():
+        for cls in [*self.getAllTraits(), self]:
+            for key, callback in cls.__get_defined_functions("getCallbacks").items():
+                if cls != self and key in arr.keys():
                     raise Exception(
                         key
                         + " callback key is duplicated in traits in "
                         + self.__name__
                     )
+                if not re.match(r"^[a-zA-Z][\w-]{0,}__[\w-]{1,}(|@defer)", key):
+                    raise Exception(
+                        key + " callback key is not support pattern in " + cls.__name__
+                    )
                 arr[key] = callback
 
-        for key, callback in self.__get_defined_functions("getCallbacks").items():
-            if not re.match(r"^[a-zA-Z][\w-]{0,}__[\w-]{1,}(|@defer)", key):
-                raise Exception(
-                    key + " callback key is not support pattern in " + self.__name__
-                )
-            arr[key] = callback
+        return arr
+
+    @classmethod
+    def getAllLoaderOptions(self):
+        arr = {}
+        for cls in [*self.getAllTraits(), self]:
+            arr.update(cls.getLoaderOptions())
 
         return arr
 
     @classmethod
     def getAllLoaders(self):
         arr = {}
-        for cls in self.getTraits():
-            for key, loader in cls.getAllLoaders().items():
-                if key in arr.keys():
+        for cls in [*self.getAllTraits(), self]:
+            for key, loader in cls.__get_defined_functions("getLoaders").items():
+                if cls != self and key in arr.keys():
                     raise Exception(
                         key + " loader key is duplicated in traits in " + cls.__name__
                     )
+                if not re.match(r"^[a-zA-Z][\w-]{0,}", key):
+                    raise Exception(
+                        key + " loader key is not support pattern in " + cls.__name__
+                    )
                 arr[key] = loader
 
-        for key, loader in self.__get_defined_functions("getLoaders").items():
-            if not re.match(r"^[a-zA-Z][\w-]{0,}", key):
-                raise Exception(
-                    key + " loader key is not support pattern in " + self.__name__
-                )
-            arr[key] = loader
-
         return arr
 
     @classmethod
@@ -172,33 +295,46 @@ class ServiceBase(ABC):
 
     @classmethod
     def getAllRuleLists(self):
-        arr = {}
+        classes = [*self.getAllTraits(), self]
+        arr = ServiceBase.__ruleLists.get(self)
 
-        for cls in [*self.getAllTraits(), self]:
-            arr[cls] = {}
-            for key, ruleList in cls.getRuleLists().items():
-                if not isinstance(ruleList, list):
-                    ruleList = [ruleList]
-                if key not in arr[cls].keys():
-                    arr[cls][key] = []
-                for rule in ruleList:
-                    arr[cls][key].append(rule)
+        if arr is None:
+            arr = []
 
-        return arr
+            for cls in classes:
+                ruleLists = {}
+                for key, ruleList in cls.getRuleLists().items():
+                    if not isinstance(ruleList, list):
+                        ruleList = [ruleList]
+                    if key not in ruleLists.keys():
+                        ruleLists[key] = []
+                    for rule in ruleList:
+                        ruleLists[key].append(rule)
+                arr.append(ruleLists)
+
+            ServiceBase.__ruleLists[self] = arr
+
+        return {cls: {**ruleLists} for cls, ruleLists in zip(classes, arr)}
 
     @classmethod
     def getAllTraits(self) -> List[Self]:
+        arr = ServiceBase.__traits.get(self)
+
+        if arr is not None:
+            return [*arr]
+
         arr = []
 
         for cls in self.getTraits():
-            if ServiceBase not in cls.__bases__:
+            if not self.isServiceClass(cls):
                 raise Exception("trait class must extends Service")
-            arr = [*arr, *cls.getAllTraits()]
+            arr.extend(cls.getAllTraits())
 
-        arr = [*arr, *self.getTraits()]
-        arr = list(set(arr))
+        arr.extend(self.getTraits())
+        arr = list(dict.fromkeys(arr))
+        ServiceBase.__traits[self] = arr
 
-        return arr
+        return [*arr]
 
     @staticmethod
     def getBindNames():
@@ -208,18 +344,47 @@ class ServiceBase(ABC):
     def getCallbacks():
         pass
 
+    @staticmethod
+    def getDeferExecutor():
+        return ServiceBase.__deferExecutor
+
+    @staticmethod
+    def getLoaderOptions():
+        return {}
+
     @staticmethod
     def getLoaders():
         pass
 
+    @staticmethod
+    def getProcessPoolExecutor() -> Executor:
+        if not ServiceBase.__processPoolExecutor:
+            ServiceBase.__processPoolExecutor = ProcessPoolExecutor()
+
+        return ServiceBase.__processPoolExecutor
+
     @staticmethod
     def getPromiseLists():
         return {}
 
+    @classmethod
+    def getResultCache(self):
+        if self.getAllCallbacks():
+            return None
+
+        return self.__resultCache
+
     @staticmethod
     def getRuleLists():
         return {}
 
+    @staticmethod
+    def getThreadPoolExecutor() -> Executor:
+        if not ServiceBase.__threadPoolExecutor:
+            ServiceBase.__threadPoolExecutor = ThreadPoolExecutor()
+
+        return ServiceBase.__threadPoolExecutor
+
     @staticmethod
     def getTraits():
         return []
@@ -227,19 +392,22 @@ class ServiceBase(ABC):
     @staticmethod
     def initService(value):
         if len(value) < 2:
-            value[1] = {}
+            value.append({})
         if len(value) < 3:
-            value[2] = {}
+            value.append({})
 
         cls = value[0]
         data = value[1]
         names = value[2]
 
-        for key, value in data:
-            if "" == value:
+        for key in [*data.keys()]:
+            if "" == data[key]:
                 del data[key]
 
-        return cls().setWith(data, names)
+        service = cls.acquire()
+        service.__isPoolable = True
+
+        return service.setWith(data, names)
 
     @classmethod
     def isInitable(self, value):
@@ -251,25 +419,94 @@ class ServiceBase(ABC):
 
     @classmethod
     def isServiceClass(self, value):
-        if not isinstance(value, type):
-            return False
+        return isinstance(value, type) and value in ServiceBase.__serviceClasses
 
-        isService = False
-        for x in value.__bases__:
-            if x == ServiceBase:
-                isService = True
-            elif x != object:
-                isService = self.isServiceClass(x)
-        return isService
+    @staticmethod
+    def iterStreamedResponseBody(results, getTotalErrors):
+        encoder = json.JSONEncoder()
+        separator = ""
+        yield '{"result": ['
+
+        for result in results:
+            yield separator
+            yield from encoder.iterencode(result)
+            separator = ", "
+
+        yield "]"
+        totalErrors = getTotalErrors()
+
+        if totalErrors:
+            yield ', "errors": '
+            yield from encoder.iterencode(totalErrors)
+
+        yield "}"
+
+    @staticmethod
+    def setDeferExecutor(executor):
+        ServiceBase.__deferExecutor = executor
+
+    @staticmethod
+    def setProcessPoolExecutor(executor: Executor | None):
+        ServiceBase.__processPoolExecutor = executor
+
+    @classmethod
+    def setResultCache(self, resultCache):
+        self.__resultCache = resultCache
+
+    @staticmethod
+    def setThreadPoolExecutor(executor: Executor | None):
+        ServiceBase.__threadPoolExecutor = executor
+
+    @classmethod
+    @contextlib.contextmanager
+    def withLifecycleCallbacks(self, onStart=None, onSuccess=None, onFail=None):
+        entries = [
+            (self, event, callback)
+            for event, callback in [
+                ("start", onStart),
+                ("success", onSuccess),
+                ("fail", onFail),
+            ]
+            if callback
+        ]
+        scopedCallbacks = ServiceBase.__scopedLifecycleCallbacks.get()
+        token = ServiceBase.__scopedLifecycleCallbacks.set((*scopedCallbacks, *entries))
+
+        try:
+            yield
+        finally:
+            ServiceBase.__scopedLifecycleCallbacks.reset(token)
 
     def getChilds(self):
-        return copy.deepcopy(self.__childs)
+        return {**self.__childs}
 
     def getData(self):
         return copy.deepcopy(self.__data)
 
+    def getDependencyGraph(self):
+        keys = [*self.__inputs.keys()]
+
+        for ruleLists in self.getAllRuleLists().values():
+            keys.extend(ruleLists.keys())
+
+        keys.extend(self.getAllLoaders().keys())
+        graph = {}
+
+        while keys:
+            key = keys.pop(0)
+            if key in graph:
+                continue
+            graph[key] = self.__getDependencyKeys(key)
+            keys.extend(graph[key])
+
+        return graph
+
     def getErrors(self):
-        return copy.deepcopy(self.__errors)
+        errors = {}
+        for key, errorList in self.__errors.items():
+            errors[key] = [str(error) for error in errorList]
+
+        return errors
 
     def getInjectedPropNames(self):
         injectedPropNames = []
@@ -286,119 +523,171 @@ class ServiceBase(ABC):
     def getInputs(self):
         return copy.deepcopy(self.__inputs)
 
+    def getLoaderStats(self):
+        return {
+            key: {"attempts": stats["attempts"], "latencies": [*stats["latencies"]]}
+            for key, stats in self.__loaderStats.items()
+        }
+
     def getNames(self):
         return copy.deepcopy(self.__names)
 
-    def getTotalErrors(self):
-        errors = self.getErrors()
-
-        for key, child in self.getChilds().items():
-            childErrors = child.getTotalErrors()
-            if childErrors:
-                errors[key] = childErrors
+    def getStructuredErrors(self):
+        return {key: [*errorList] for key, errorList in self.__errors.items()}
 
-        return errors
+    def getTotalErrors(self):
+        return renderTotalErrors(self.__totalErrors)
 
     def getValidations(self):
         return copy.deepcopy(self.__validations)
 
-    def resolveBindName(self, name):
-        while True:
-            boundKeys = self.__getBindKeysInName(name)
-            if not boundKeys:
-                break
+    def hasTotalErrors(self):
+        return bool(self.__totalErrors)
 
-            key = boundKeys[0]
-            keySegs = key.split(".")
-            mainKey = keySegs[0]
-            bindNames = copy.deepcopy(self.getAllBindNames())
-            bindNames.update(self.__names)
+    def iterResponseBody(self) -> Iterator[str]:
+        encoder = json.JSONEncoder()
+        response = self.__runStreaming()
 
-            if mainKey in bindNames:
-                bindName = bindNames[mainKey]
-            else:
-                raise Exception(
-                    '"' + mainKey + '" name not exists in ' + self.__class__.__name__,
-                )
+        if self.__stream is None or self.hasTotalErrors():
+            yield from encoder.iterencode(response)
+            return
 
-            pattern = r"\{\{(\s*)" + key + r"(\s*)\}\}"
-            replace = self.resolveBindName(bindName)
-            name = re.sub(pattern, replace, name)
-            matches = re.findall(r"\[\.\.\.\]", name)
+        totalErrors = {}
 
-            if len(matches) > 1:
-                raise Exception(
-                    name + ' has multiple "[...]" string in ' + self.__class__.__name__
-                )
-            if self.__hasArrayObjectRuleInRuleLists(mainKey) and not matches:
-                raise Exception(
-                    '"'
-                    + mainKey
-                    + '" name is required "[...]" string in '
-                    + self.__class__.__name__
-                )
+        def iterResults():
+            for i, (resolved, errors) in enumerate(self.__iterStream()):
+                if errors:
+                    totalErrors["result." + str(i)] = errors
+                    continue
 
-            if len(keySegs) > 1:
-                replace = "[" + "][".join(keySegs[1:]) + "]"
-                name = re.sub(r"\[\.\.\.\]", replace, name)
+                yield resolved
 
-        return name
+        yield from self.iterStreamedResponseBody(iterResults(), lambda: totalErrors)
 
-    def run(self):
-        if self.__isRun:
-            raise Exception("already run service [" + self.__class__.__name__ + "]")
+    def iterRun(self) -> Iterator[Dict[str, Any]]:
+        response = self.__runStreaming()
 
-        self.__childs = {}
-        self.__data = {}
-        self.__errors = {}
-        self.__validations = {}
+        if self.__stream is None or self.hasTotalErrors():
+            yield response
+            return
+
+        for resolved, totalErrors in self.__iterStream():
+            yield self.getResponseBody(
+                None if totalErrors else resolved,
+                totalErrors,
+            )
 
-        totalErrors = self.getTotalErrors()
+    def release(self):
+        self.reset()
 
+        if self.POOL_SIZE <= 0:
+            return
+
+        with ServiceBase.__poolLock:
+            pool = ServiceBase.__pools.setdefault(self.__class__, [])
+            if len(pool) < self.POOL_SIZE:
+                pool.append(self)
+
+    def rerun(self):
         if not self.__isRun:
-            if not self.__parent:
-                for callback in self.__onStartCallbacks:
-                    callback()
-            else:
-                for key in self.__names.keys():
-                    self.__names[key] = self.__parent.resolveBindName(self.__names[key])
+            return self.run()
 
-            for key in self.getInputs().keys():
-                self.__validate(key)
+        changedKeys = self.__changedKeys
+        graph = self.getDependencyGraph()
+        dependents = {}
 
-            for cls in self.getAllRuleLists().keys():
-                for key in self.getAllRuleLists()[cls].keys():
-                    self.__validate(key)
+        for key, deps in graph.items():
+            for dep in deps:
+                dependents.setdefault(dep, []).append(key)
 
-            for key in self.getAllLoaders().keys():
-                self.__validate(key)
+        invalidKeys = set()
+        keys = [*changedKeys, *self.__abortedKeys]
 
-            totalErrors = self.getTotalErrors()
+        while keys:
+            key = keys.pop()
+            if key in invalidKeys:
+                continue
+            invalidKeys.add(key)
+            keys.extend(dependents.get(key, []))
 
-            if not self.__parent:
-                if not totalErrors:
-                    self.__runAllDeferCallbacks()
-                    for callback in self.__onSuccessCallbacks:
-                        callback()
-                else:
-                    for callback in self.__onFailCallbacks:
-                        callback()
+        for key in invalidKeys:
+            self.__invalidate(key)
 
-            self.__isRun = True
+        self.__abortedKeys = set()
+        self.__changedKeys = set()
+        self.__isAborted = False
+        self.__stream = None
 
-        if self.__parent:
-            if totalErrors:
-                return self.__resolveError()
+        return self.__trampoline(self.__execute(invalidKeys))
 
-            return self.getData()["result"]
+    def reset(self):
+        for errorList in self.__errors.values():
+            for error in errorList:
+                error.getName()
 
-        result = self.getData()["result"] if "result" in self.getData().keys() else None
+        stack = [*self.__childs.values()]
+
+        while stack:
+            child = stack.pop()
+            if isinstance(child, ServiceBase) and child.__isPoolable:
+                stack.extend(child.__childs.values())
+                child.__childs = {}
+                child.release()
+
+        self.__changedKeys = set()
+        self.__childs = {}
+        self.__data = {}
+        self.__deadline = None
+        self.__errors = {}
+        self.__futures = {}
+        self.__hasCallbacks = False
+        self.__inputs = {}
+        self.__totalErrors = {}
+        self.__isAborted = False
+        self.__isFailFast = False
+        self.__isLazy = False
+        self.__isPoolable = False
+        self.__isRun = False
+        self.__isStreaming = False
+        self.__names = {}
+        self.__parent = None
+        self.__profiler = None
+        self.__stream = None
+        self.__validations = {}
+
+    def resolveBindName(self, name):
+        return self.__trampoline(self.__resolveBindName(name))
+
+    def run(self):
+        return self.__trampoline(self.__run())
+
+    def setDeadline(self, seconds: float):
+        if self.__isRun:
+            raise Exception("already run service [" + self.__class__.__name__ + "]")
 
-        return self.getResponseBody(result, totalErrors)
+        self.__deadline = time.monotonic() + seconds
+
+    def setFailFast(self, isFailFast: bool = True):
+        if self.__isRun:
+            raise Exception("already run service [" + self.__class__.__name__ + "]")
+
+        self.__isFailFast = isFailFast
+
+    def setLazy(self, isLazy: bool = True):
+        if self.__isRun:
+            raise Exception("already run service [" + self.__class__.__name__ + "]")
+
+        self.__isLazy = isLazy
 
     def setParent(self, parent):
         self.__parent = parent
 
+    def setProfiler(self, profiler):
+        if self.__isRun:
+            raise Exception("already run service [" + self.__class__.__name__ + "]")
+
+        self.__profiler = profiler
+
     def setWith(
         self,
         inputs: Dict[str, Any] = {},
@@ -444,10 +733,121 @@ class ServiceBase(ABC):
         self.getAllCallbacks()
         self.getAllLoaders()
 
+        if self.__isPoolable:
+            return self
+
         return self._clone()
 
+    def update(self, inputs: Dict[str, Any]):
+        for key in inputs.keys():
+            if key in self.getInjectedPropNames():
+                raise Exception(
+                    key
+                    + " input key is duplicated with property in "
+                    + self.__class__.__name__
+                )
+
+            if not re.match(r"^[a-zA-Z][\w-]{0,}", key):
+                raise Exception(
+                    key
+                    + " input key is not support pattern in "
+                    + self.__class__.__name__
+                )
+
+        changedKeys = set(self.__changedKeys)
+        updatedInputs = {**self.__inputs}
+
+        for key, value in inputs.items():
+            if "" == value:
+                if key in updatedInputs:
+                    del updatedInputs[key]
+                    changedKeys.add(key)
+            elif key not in updatedInputs or updatedInputs[key] != value:
+                updatedInputs[key] = value
+                changedKeys.add(key)
+
+        self.__changedKeys = changedKeys
+        self.__inputs = updatedInputs
+
+    def validateKeys(self, keys: List[str]):
+        if not self.__isRun:
+            self.__initRunState()
+
+        for key in keys:
+            self.__trampoline(self.__validate(key))
+
+        errors = {}
+        for key, error in self.getTotalErrors().items():
+            for k in keys:
+                if key == k or key.startswith(k + "."):
+                    errors[key] = error
+
+        return errors
+
+    def writeResponseBody(self, fp):
+        for chunk in self.iterResponseBody():
+            fp.write(chunk)
+
     def _clone(self):
-        return copy.copy(self)
+        clone = copy.copy(self)
+        clone.__inputs = {**self.__inputs}
+        clone.__names = {**self.__names}
+
+        return clone
+
+    def __compact(self):
+        return ChildResult(
+            self.__totalErrors,
+            self.__getAllDeferCallbacks(),
+            self.__hasCallbacks,
+        )
+
+    def __execute(self, deferKeys=None):
+        if not self.__parent:
+            self.__runLifecycleCallbacks("start")
+        else:
+            self.__isFailFast = self.__isFailFast or self.__parent.__isFailFast
+            self.__isLazy = self.__isLazy or self.__parent.__isLazy
+            self.__profiler = self.__profiler or self.__parent.__profiler
+            if self.__parent.__deadline is not None:
+                self.__deadline = (
+                    self.__parent.__deadline
+                    if self.__deadline is None
+                    else min(self.__deadline, self.__parent.__deadline)
+                )
+            self.__names = {
+                key: self.__parent.resolveBindName(name)
+                for key, name in self.__names.items()
+            }
+
+        with self.__measure("service", self.__class__.__name__):
+            yield self.__validateAll()
+
+        if self.__isAborted:
+            for future in self.__futures.values():
+                future.cancel()
+            self.__futures = {}
+
+        hasTotalErrors = self.hasTotalErrors()
+
+        if not self.__parent and (self.__stream is None or hasTotalErrors):
+            self.__runFinishCallbacks(
+                hasTotalErrors, self.__getAllDeferCallbacks(deferKeys)
+            )
+
+        self.__isRun = True
+
+        if self.__parent:
+            if hasTotalErrors:
+                return self.__resolveError()
+
+            return self.getData()["result"]
+
+        result = self.getData()["result"] if "result" in self.getData().keys() else None
+
+        return self.getResponseBody(
+            result, self.getTotalErrors() if hasTotalErrors else {}
+        )
 
     def __filterAvailableExpandedRuleLists(self, cls, data, ruleLists):
 
@@ -461,63 +861,41 @@ class ServiceBase(ABC):
                         parentKey + " key must has array rule in " + cls.__name__
                     )
 
-        i = 0
         while True:
-            i = i + 1
-            filteredRuleLists = dict(
+            wildcardKeys = list(
                 filter(
-                    lambda k: re.match(r"\.\*$", k[0]) or re.match(r"\.\*\.", k[0]),
-                    ruleLists.items(),
+                    lambda k: getCompiledPath(k).wildcardIndex != -1,
+                    ruleLists.keys(),
                 )
             )
 
-            if len(filteredRuleLists) == 0:
+            if len(wildcardKeys) == 0:
                 break
 
-            for rKey in filteredRuleLists.keys():
-                matches = re.match(r"^(.+?)\.\*", rKey)
-                allSegs = (matches[1] + ".*").split(".")
-                segs = []
-                rKeyVal = dict(data)
-                isLastKeyExists = True
-
-                while allSegs:
-                    seg = allSegs.pop(0)
-                    segs.append(seg)
-                    k = ".".join(segs)
+            for rKey in wildcardKeys:
+                for rNewKey in getCompiledPath(rKey).expand(data):
+                    ruleLists[rNewKey] = ruleLists[rKey]
 
-                    if not isinstance(rKeyVal, dict) or (
-                        len(allSegs) != 0 and seg not in rKeyVal
-                    ):
-                        isLastKeyExists = False
-
-                        break
-
-                    if len(allSegs) != 0:
-                        rKeyVal = rKeyVal[seg]
+                del ruleLists[rKey]
 
-                if isLastKeyExists:
-                    for k, v in rKeyVal:
-                        rNewKey = re.sub(
-                            r"^" + matches[1] + r"\.\*", matches[1] + r"." + k, rKey
-                        )
-                        ruleLists[rNewKey] = ruleLists[rKey]
+        for rKey in [*ruleLists.keys()]:
+            if rKey not in ruleLists:
+                continue
 
-                del ruleLists[rKey]
+            path = getCompiledPath(rKey)
+            rKeyVal = data
 
-        for rKey in ruleLists.keys():
-            allSegs = rKey.split(".")
-            segs = []
-            rKeyVal = dict(data)
-            while allSegs:
-                seg = allSegs.pop(0)
-                segs.append(seg)
-                k = ".".join(segs)
+            for i, seg in enumerate(path.segs):
+                k = path.prefixes[i]
+                isLastSeg = i == len(path.segs) - 1
 
                 if k not in ruleLists:
                     break
 
-                if isinstance(rKeyVal, dict) and seg not in rKeyVal.keys():
+                isContainer = isinstance(rKeyVal, (dict, list))
+                subVal = CompiledPath.step(rKeyVal, seg) if isContainer else MISSING
+
+                if isContainer and subVal is MISSING:
                     ruleLists[k] = list(
                         filter(
                             lambda rule: cls.filterPresentRelatedRule(rule),
@@ -525,42 +903,131 @@ class ServiceBase(ABC):
                         )
                     )
 
-                if not isinstance(rKeyVal, dict) or (
-                    len(allSegs) != 0 and seg not in rKeyVal
-                ):
-                    removeRuleLists = dict(
-                        filter(
-                            lambda v: re.match(r"^" + k + r"\.", v[0]),
-                            ruleLists.items(),
-                        )
-                    )
-
-                    for v in removeRuleLists.keys():
-                        del ruleLists[v]
+                if not isContainer or (not isLastSeg and subVal is MISSING):
+                    for v in [*ruleLists.keys()]:
+                        if v.startswith(k + "."):
+                            del ruleLists[v]
 
                     break
 
-                if len(allSegs) != 0:
-                    rKeyVal = rKeyVal[seg]
+                rKeyVal = subVal
 
         return ruleLists
 
+    def __getAllDeferCallbacks(self, keys=None):
+        deferCallbacks = self.__getDeferCallbacks(keys)
+        stack = [
+            child
+            for childKey, child in reversed(self.__childs.items())
+            if keys is None or childKey.split(".")[0] in keys
+        ]
+
+        while stack:
+            service = stack.pop()
+
+            if isinstance(service, ChildResult):
+                deferCallbacks.extend(service.deferCallbacks)
+                continue
+
+            deferCallbacks.extend(service.__getDeferCallbacks())
+            stack.extend(reversed(service.__childs.values()))
+
+        return deferCallbacks
+
     def __getBindKeysInName(self, str):
         return re.findall(self.BIND_NAME_EXP, str)
 
     def __getClosureDependencies(self, func, excludeProps=True):
+        names = getBinder(func).names
+
+        if not excludeProps:
+            return [*names]
+
+        props = self.__getInjectedPropNameSet()
+
+        return [key for key in names if key not in props]
+
+    def __getDeferCallbacks(self, keys=None):
+        deferCallbacks = []
+        callbacks = dict(
+            filter(
+                lambda x: re.search(self.DEFER_CALLBACK_EXP, x[0]),
+                self.getAllCallbacks().items(),
+            )
+        )
+
+        for key, callback in callbacks.items():
+            mainKey = key.split("__")[0]
+
+            if keys is not None and mainKey not in keys:
+                continue
+
+            if not self.__validations.get(mainKey):
+                continue
+
+            args = self.__resolveArgs(callback)
+
+            if self.__isResolveError(args):
+                continue
+
+            deferCallbacks.append((callback, args))
+
+        return deferCallbacks
+
+    def __getDependencyKeys(self, key):
         deps = []
-        params = inspect.signature(func).parameters
-        props = self.getInjectedPropNames()
+        keySegs = key.split(".")
+        mainKey = keySegs[0]
 
-        for key in params.keys():
-            if excludeProps:
-                if not key in props:
-                    deps.append(key)
-            else:
-                deps.append(key)
+        for i in range(len(keySegs) - 1):
+            deps.append(".".join(keySegs[0 : i + 1]))
+
+        promiseLists = self.getAllPromiseLists()
+        deps.extend(promiseLists[mainKey] if mainKey in promiseLists else [])
+
+        loaders = self.getAllLoaders()
+        if mainKey in loaders:
+            deps.extend(self.__getClosureDependencies(loaders[mainKey]))
+
+        callbacks = self.getAllCallbacks()
+        for callbackKey in self.__getOrderedCallbackKeys(key):
+            deps.extend(self.__getClosureDependencies(callbacks[callbackKey]))
+
+        for cls in self.getAllRuleLists().keys():
+            for ruleList in self.__getRelatedRuleLists(key, cls).values():
+                for rule in ruleList:
+                    deps.extend(cls.getDependencyKeysInRule(rule))
+
+        return [dep for i, dep in enumerate(deps) if dep != key and dep not in deps[:i]]
+
+    def __getHedgeDelay(self, key):
+        options = self.getAllLoaderOptions()[key]
+        history = sorted(self.__getLatencyHistory(key))
+
+        if len(history) < self.HEDGE_MIN_SAMPLES:
+            return options.get("hedgeDelay", 0.05)
+
+        index = int(len(history) * options.get("hedgePercentile", 95) / 100)
+
+        return history[min(index, len(history) - 1)]
 
-        return deps
+    def __getInjectedPropNameSet(self):
+        if self.__propNames is None:
+            self.__propNames = set(self.getInjectedPropNames())
+
+        return self.__propNames
+
+    def __getLatencyHistory(self, key):
+        cls = self.__class__
+
+        with ServiceBase.__cacheLock:
+            if cls not in ServiceBase.__latencyHistory:
+                ServiceBase.__latencyHistory[cls] = {}
+            histories = ServiceBase.__latencyHistory[cls]
+            if key not in histories:
+                histories[key] = deque(maxlen=100)
+
+            return histories[key]
 
     def __getLoadedDataWith(self, key):
         data = self.getData()
@@ -576,11 +1043,34 @@ class ServiceBase(ABC):
         else:
             if not loader:
                 return data
-            value = self.__resolve(loader)
+            timeout = self.__getLoaderTimeout(key)
+
+            with self.__measure("loader", key):
+                try:
+                    if timeout is not None and timeout <= 0:
+                        raise TimeoutError()
+                    if self.__isCpuBoundLoader(key):
+                        value = self.__resolveInProcess(key, loader, timeout)
+                    elif self.__isIdempotentLoader(key):
+                        value = self.__resolveWithRetries(key, loader)
+                    elif timeout is not None:
+                        value = self.__resolveInThread(loader, timeout)
+                    else:
+                        value = self.__resolve(loader)
+                except TimeoutError:
+                    self.__setTimeoutError(key)
+                    return data
 
         if self.__isResolveError(value):
             return data
 
+        if self.__isStreaming and "result" == key and self.__isStreamable(value):
+            self.__stream = value
+            return data
+
+        if inspect.isgenerator(value):
+            value = list(value)
+
         hasServicesInArray = False
 
         if value and isinstance(value, list):
@@ -591,36 +1081,28 @@ class ServiceBase(ABC):
         values = value if hasServicesInArray else [value]
         hasResolveError = False
 
-        for i, v in enumerate(values):
-            service = None
+        if hasServicesInArray and self.MAX_CHILDS_IN_FLIGHT > 0:
+            hasResolveError = yield self.__runChildsInFlight(key, values)
+            if not hasResolveError:
+                self.__data[key] = values
+            return self.__data
 
-            if self.isInitable(v):
-                if len(v) < 2:
-                    v.append({})
-                if len(v) < 3:
-                    v.append({})
-
-                for k, name in v[2].items():
-                    v[2][k] = self.resolveBindName(name)
-
-                service = self.initService(v)
-                service.setParent(self)
-                resolved = service.run()
-            elif isinstance(v, ServiceBase):
-                service = v
-                service.setParent(self)
-                resolved = service.run()
+        for i, v in enumerate(values):
+            service, resolved = yield self.__runChild(
+                v, key + "." + str(i) if hasServicesInArray else key
+            )
 
             if service:
-                if hasServicesInArray:
-                    self.__childs[key + "." + str(i)] = service
-                else:
-                    self.__childs[key] = service
+                self.__setChild(
+                    key + "." + str(i) if hasServicesInArray else key, service
+                )
 
                 if self.__isResolveError(resolved):
-                    del values[i]
                     hasResolveError = True
                     self.__validations[key] = False
+                    if self.__isFailFast:
+                        self.__isAborted = True
+                        break
                 values[i] = resolved
 
         if not hasResolveError:
@@ -628,6 +1110,30 @@ class ServiceBase(ABC):
 
         return self.__data
 
+    def __getLoaderTimeout(self, key):
+        options = self.getAllLoaderOptions()
+        timeout = options[key].get("timeout") if key in options else None
+
+        if self.__deadline is not None:
+            remaining = self.__deadline - time.monotonic()
+            timeout = remaining if timeout is None else min(timeout, remaining)
+
+        return timeout
+
+    def __getNameResolver(self, keys):
+        keys = set(keys)
+        resolved = {}
+
+        def resolveName(key):
+            if key not in keys:
+                return key
+            if key not in resolved:
+                resolved[key] = self.resolveBindName("{{" + key + "}}")
+
+            return resolved[key]
+
+        return resolveName
+
     def __getOrderedCallbackKeys(self, key):
         promiseKeys = list(
             filter(
@@ -667,6 +1173,25 @@ class ServiceBase(ABC):
 
         return filterLists
 
+    def __getResultCacheKey(self):
+        def serialize(value):
+            if self.isServiceClass(value):
+                return value.__module__ + "." + value.__qualname__
+            raise TypeError()
+
+        cls = self.__class__
+
+        try:
+            payload = json.dumps(
+                [cls.__module__, cls.__qualname__, self.__inputs, self.__names],
+                sort_keys=True,
+                default=serialize,
+            )
+        except (TypeError, ValueError):
+            return None
+
+        return hashlib.sha256(payload.encode()).hexdigest()
+
     def __getShouldOrderedCallbackKeys(self, keys):
         arr = []
 
@@ -686,60 +1211,515 @@ class ServiceBase(ABC):
                 hasArrayObjectRule = True
         return hasArrayObjectRule
 
+    def __initRunState(self):
+        self.__abortedKeys = set()
+        self.__childs = {}
+        self.__data = {}
+        self.__errors = {}
+        self.__futures = {}
+        self.__hasCallbacks = bool(self.getAllCallbacks())
+        self.__isAborted = False
+        self.__isPrefetching = False
+        self.__loaderStats = {}
+        self.__propNames = None
+        self.__stream = None
+        self.__timedOutKeys = set()
+        self.__totalErrors = {}
+        self.__validations = {}
+
+    def __invalidate(self, key):
+        def isRelated(k):
+            return k == key or k.startswith(key + ".")
+
+        for k in list(filter(isRelated, self.__validations.keys())):
+            del self.__validations[k]
+        for k in list(filter(isRelated, self.__data.keys())):
+            del self.__data[k]
+        for k in list(filter(isRelated, self.__errors.keys())):
+            del self.__errors[k]
+        for k in list(filter(isRelated, self.__totalErrors.keys())):
+            del self.__totalErrors[k]
+        for k in list(filter(isRelated, self.__childs.keys())):
+            child = self.__childs.pop(k)
+            if isinstance(child, ServiceBase) and child.__isPoolable:
+                child.release()
+
+        self.__timedOutKeys = set(
+            filter(lambda k: not isRelated(k), self.__timedOutKeys)
+        )
+
+    def __isCpuBoundLoader(self, key):
+        options = self.getAllLoaderOptions()
+
+        return key in options and options[key].get("cpuBound", False)
+
+    def __isIdempotentLoader(self, key):
+        options = self.getAllLoaderOptions()
+        options = options[key] if key in options else {}
+
+        if not options.get("idempotent"):
+            if options.get("retries") or options.get("hedge"):
+                raise Exception(
+                    "retries and hedge require idempotent loader ["
+                    + key
+                    + "] in "
+                    + self.__class__.__name__
+                )
+            return False
+
+        return True
+
     def __isResolveError(self, value):
         errorClass = self.__resolveError().__class__
 
         return isinstance(value, errorClass)
 
+    def __isStreamable(self, value):
+        if inspect.isgenerator(value):
+            return True
+
+        if isinstance(value, list):
+            for v in value:
+                if self.isInitable(v):
+                    return True
+
+        return False
+
+    def __iterStream(self):
+        deferCallbacks = self.__getAllDeferCallbacks()
+        hasTotalErrors = False
+
+        for value in self.__stream:
+            service, resolved = self.__trampoline(self.__runChild(value))
+
+            if not service:
+                yield resolved, {}
+                continue
+
+            totalErrors = service.getTotalErrors()
+
+            if totalErrors:
+                hasTotalErrors = True
+            else:
+                deferCallbacks.extend(service.__getAllDeferCallbacks())
+
+            if service.__isPoolable:
+                service.release()
+
+            yield resolved, totalErrors
+
+            if totalErrors and self.__isFailFast:
+                break
+
+        self.__runFinishCallbacks(hasTotalErrors, deferCallbacks)
+
+    def __measure(self, kind, name):
+        if not self.__profiler:
+            return contextlib.nullcontext()
+
+        return self.__profiler.measure(kind, name)
+
     def __resolve(self, func):
-        props = self.getInjectedPropNames()
-        depNames = self.__getClosureDependencies(func, False)
-        depVals = []
-        params = {}
+        depVals = self.__resolveArgs(func)
+
+        if self.__isResolveError(depVals):
+            return depVals
+
+        return func(*depVals)
 
-        for key, param in inspect.signature(func).parameters.items():
-            params[key] = param
+    def __resolveArgs(self, func):
+        binder = getBinder(func)
+        props = self.__getInjectedPropNameSet()
+        depVals = []
 
-        for i, depName in enumerate(depNames):
+        for depName in binder.names:
             if depName in props:
                 depVals.append(getattr(self, depName))
-            elif self.__validations[depName] and depName in self.__data.keys():
+            elif not self.__validations.get(depName):
+                return self.__resolveError()
+            elif depName in self.__data:
                 depVals.append(self.__data[depName])
-            elif (
-                self.__validations[depName]
-                and params[depName].default != inspect.Parameter.empty
-            ):
-                depVals.append(params[depName].default)
+            elif depName in binder.defaults:
+                depVals.append(binder.defaults[depName])
             else:
                 return self.__resolveError()
 
-        return func(*depVals)
+        return depVals
+
+    def __resolveBindName(self, name):
+        while True:
+            boundKeys = self.__getBindKeysInName(name)
+            if not boundKeys:
+                break
+
+            key = boundKeys[0]
+            keySegs = key.split(".")
+            mainKey = keySegs[0]
+            bindNames = copy.deepcopy(self.getAllBindNames())
+            bindNames.update(self.__names)
+
+            if mainKey in bindNames:
+                bindName = bindNames[mainKey]
+            else:
+                raise Exception(
+                    '"' + mainKey + '" name not exists in ' + self.__class__.__name__,
+                )
+
+            pattern = r"\{\{(\s*)" + key + r"(\s*)\}\}"
+            replace = yield self.__resolveBindName(bindName)
+            name = re.sub(pattern, replace, name)
+            matches = re.findall(r"\[\.\.\.\]", name)
+
+            if len(matches) > 1:
+                raise Exception(
+                    name + ' has multiple "[...]" string in ' + self.__class__.__name__
+                )
+            if self.__hasArrayObjectRuleInRuleLists(mainKey) and not matches:
+                raise Exception(
+                    '"'
+                    + mainKey
+                    + '" name is required "[...]" string in '
+                    + self.__class__.__name__
+                )
+
+            if len(keySegs) > 1:
+                replace = "[" + "][".join(keySegs[1:]) + "]"
+                name = re.sub(r"\[\.\.\.\]", replace, name)
+
+        return name
 
     def __resolveError(self):
         return Exception("can't be resolve")
 
-    def __runAllDeferCallbacks(self):
-        callbacks = list(
-            filter(
-                lambda key: re.match("/:defer$/", key[0]),
-                self.getAllCallbacks().items(),
+    def __resolveHedged(self, key, loader, depVals, timeout):
+        options = self.getAllLoaderOptions()[key]
+        executor = self.getThreadPoolExecutor()
+        start = time.monotonic()
+        futures = [
+            executor.submit(copy_context().run, self.__runAttempt, key, loader, depVals)
+        ]
+
+        if options.get("hedge"):
+            delay = self.__getHedgeDelay(key)
+            if timeout is not None:
+                delay = min(delay, timeout)
+            if not wait(futures, delay)[0]:
+                futures.append(
+                    executor.submit(
+                        copy_context().run, self.__runAttempt, key, loader, depVals
+                    )
+                )
+
+        pending = futures
+
+        while pending:
+            remaining = (
+                None if timeout is None else timeout - (time.monotonic() - start)
+            )
+            done, pending = wait(pending, remaining, FIRST_COMPLETED)
+
+            if not done:
+                for future in pending:
+                    future.cancel()
+                raise TimeoutError()
+
+            for future in done:
+                if future.exception() is None:
+                    for other in pending:
+                        other.cancel()
+                    return future.result()
+
+        return futures[-1].result()
+
+    def __resolveInProcess(self, key, loader, timeout=None):
+        if key not in self.__futures:
+            self.__submitInProcess(key, loader)
+
+        if key not in self.__futures:
+            return self.__resolveError()
+
+        return self.__futures.pop(key).result(timeout)
+
+    def __resolveInThread(self, loader, timeout):
+        depVals = self.__resolveArgs(loader)
+
+        if self.__isResolveError(depVals):
+            return depVals
+
+        future = self.getThreadPoolExecutor().submit(
+            copy_context().run, loader, *depVals
+        )
+
+        try:
+            return future.result(timeout)
+        except TimeoutError:
+            future.cancel()
+            raise
+
+    def __resolveWithRetries(self, key, loader):
+        depVals = self.__resolveArgs(loader)
+
+        if self.__isResolveError(depVals):
+            return depVals
+
+        options = self.getAllLoaderOptions()[key]
+        retries = options.get("retries", 0)
+        self.__loaderStats[key] = {"attempts": 0, "latencies": []}
+
+        for attempt in range(retries + 1):
+            timeout = self.__getLoaderTimeout(key)
+
+            if timeout is not None and timeout <= 0:
+                raise TimeoutError()
+
+            try:
+                if timeout is None and not options.get("hedge"):
+                    return self.__runAttempt(key, loader, depVals)
+                return self.__resolveHedged(key, loader, depVals, timeout)
+            except TimeoutError:
+                raise
+            except Exception:
+                if attempt == retries:
+                    raise
+                time.sleep(options.get("backoff", 0) * 2**attempt)
+
+    def __run(self):
+        if self.__isRun:
+            raise Exception("already run service [" + self.__class__.__name__ + "]")
+
+        self.__initRunState()
+
+        resultCache = self.getResultCache()
+        cacheKey = (
+            self.__getResultCacheKey()
+            if resultCache and not self.__isStreaming
+            else None
+        )
+
+        if cacheKey:
+            body = resultCache.get(cacheKey)
+            if body is not None:
+                self.__data = {"result": copy.deepcopy(body["result"])}
+                self.__isRun = True
+                if self.__parent:
+                    return self.getData()["result"]
+                return copy.deepcopy(body)
+
+        response = yield self.__execute()
+
+        if cacheKey and not self.__hasCallbacks and not self.hasTotalErrors():
+            resultCache.set(
+                cacheKey, self.getResponseBody(self.getData().get("result"), {})
+            )
+
+        return response
+
+    def __runAttempt(self, key, loader, depVals):
+        stats = self.__loaderStats[key]
+        stats["attempts"] += 1
+        start = time.monotonic()
+
+        try:
+            return loader(*depVals)
+        finally:
+            latency = time.monotonic() - start
+            stats["latencies"].append(latency)
+            self.__getLatencyHistory(key).append(latency)
+
+    def __runChild(self, value, key=None):
+        if self.isInitable(value):
+            if len(value) < 2:
+                value.append({})
+            if len(value) < 3:
+                value.append({})
+
+            for k, name in value[2].items():
+                value[2][k] = self.resolveBindName(name)
+
+            service = self.initService(value)
+        elif isinstance(value, ServiceBase):
+            service = value
+        else:
+            return None, value
+
+        service.setParent(self)
+
+        if key is None:
+            return service, (yield service.__run())
+
+        with self.__measure("child", key):
+            return service, (yield service.__run())
+
+    def __runChildsInFlight(self, key, values):
+        hasResolveError = False
+
+        for start in range(0, len(values), self.MAX_CHILDS_IN_FLIGHT):
+            window = []
+
+            for i in range(start, min(start + self.MAX_CHILDS_IN_FLIGHT, len(values))):
+                if self.__isAborted:
+                    break
+
+                service, resolved = yield self.__runChild(values[i], key + "." + str(i))
+                values[i] = resolved
+                window.append((i, service))
+
+                if self.__isResolveError(resolved) and self.__isFailFast:
+                    self.__isAborted = True
+
+            for i, service in window:
+                if not service:
+                    continue
+
+                self.__setChild(key + "." + str(i), service.__compact())
+
+                if service.__isPoolable:
+                    service.release()
+
+                if self.__isResolveError(values[i]):
+                    hasResolveError = True
+                    self.__validations[key] = False
+
+            if self.__isAborted:
+                break
+
+        return hasResolveError
+
+    def __runFinishCallbacks(self, hasTotalErrors, deferCallbacks):
+        if hasTotalErrors:
+            self.__runLifecycleCallbacks("fail")
+            return
+
+        executor = self.getDeferExecutor()
+
+        for callback, args in deferCallbacks:
+            if executor:
+                executor.submit(callback, *args)
+            else:
+                callback(*args)
+
+        self.__runLifecycleCallbacks("success")
+
+    def __runLifecycleCallbacks(self, event):
+        for cls in reversed(self.__class__.__mro__):
+            callbacks = ServiceBase.__lifecycleCallbacks.get(cls, {})
+            for callback in callbacks.get(event, []):
+                callback()
+
+        for (
+            cls,
+            callbackEvent,
+            callback,
+        ) in ServiceBase.__scopedLifecycleCallbacks.get():
+            if callbackEvent == event and isinstance(self, cls):
+                callback()
+
+    def __runStreaming(self):
+        if self.__parent:
+            raise Exception(
+                "child service can't be run as stream [" + self.__class__.__name__ + "]"
             )
+
+        self.__isStreaming = True
+
+        return self.run()
+
+    def __setChild(self, key, child):
+        self.__childs[key] = child
+        childErrors = (
+            child.__totalErrors if isinstance(child, ServiceBase) else child.totalErrors
+        )
+        self.__hasCallbacks = self.__hasCallbacks or (
+            child.__hasCallbacks
+            if isinstance(child, ServiceBase)
+            else child.hasCallbacks
         )
 
-        for callback in callbacks:
-            self.__resolve(callback)
+        if childErrors:
+            self.__totalErrors[key] = childErrors
 
-        for child in self.__childs.values():
-            child.__runAllDeferCallbacks()
+    def __setErrors(self, key, errorList):
+        self.__errors[key] = errorList
+        self.__totalErrors[key] = errorList
+
+    def __setTimeoutError(self, key):
+        self.__timedOutKeys = {*self.__timedOutKeys, key}
+        self.__validations[key] = False
+        names = self.__getNameResolver(
+            [key] if key in {**self.getAllBindNames(), **self.__names} else []
+        )
+        self.__setErrors(
+            key,
+            [
+                ValidationError(
+                    "timeout",
+                    [],
+                    key,
+                    key + " is timed out",
+                    names,
+                    self.getValidationErrorTemplateMessages(),
+                )
+            ],
+        )
+
+        if self.__isFailFast:
+            self.__isAborted = True
+
+    def __submitCpuBoundLoaders(self):
+        if not self.__isPrefetching or self.__isAborted:
+            return
+
+        keys = list(filter(self.__isCpuBoundLoader, self.getAllLoaderOptions().keys()))
+
+        if not keys:
+            return
+
+        loaders = self.getAllLoaders()
+
+        for key in keys:
+            if (
+                key in loaders
+                and key not in self.__futures
+                and key not in self.__validations
+                and key not in self.__inputs
+            ):
+                self.__submitInProcess(key, loaders[key])
+
+    def __submitInProcess(self, key, loader):
+        args = self.__resolveArgs(loader)
+
+        if self.__isResolveError(args):
+            return
+
+        try:
+            pickle.dumps((self.__class__, key, args))
+        except (AttributeError, TypeError, pickle.PicklingError) as e:
+            raise Exception(
+                key
+                + " loader can't be run in process pool because it or its dependencies can't be pickled in "
+                + self.__class__.__name__
+                + " ("
+                + str(e)
+                + ")"
+            )
+
+        self.__futures[key] = self.getProcessPoolExecutor().submit(
+            _runLoaderInProcess, self.__class__, key, args
+        )
 
     def __validate(self, key, depth=""):
-        depth = depth if depth + "|" + key else key
+        depth = depth + "|" + key if depth else key
         depths = depth.split("|")
         mainKey = key.split(".")[0]
 
         if key in self.__validations:
             return self.__validations[key]
 
+        if self.__isAborted:
+            self.__validations[key] = False
+            self.__abortedKeys.add(key)
+            return False
+
         if len(list(filter(lambda seg: seg == key, depths))) >= 2:
             raise Exception(
                 "validation dependency circular reference["
@@ -766,7 +1746,7 @@ class ServiceBase(ABC):
         )
 
         for promise in promiseList:
-            if not self.__validate(promise, depth):
+            if not (yield self.__validate(promise, depth)):
                 self.__validations[mainKey] = False
                 return False
 
@@ -778,13 +1758,29 @@ class ServiceBase(ABC):
         deps = self.__getClosureDependencies(loader) if loader else []
 
         for dep in deps:
-            if not self.__validate(dep, depth):
+            if not (yield self.__validate(dep, depth)):
                 self.__validations[mainKey] = False
 
-        data = self.__getLoadedDataWith(mainKey)
+        if self.__isAborted:
+            self.__validations[key] = False
+            self.__abortedKeys.add(key)
+            return False
+
+        data = yield self.__getLoadedDataWith(mainKey)
+
+        if self.__isAborted or mainKey in self.__timedOutKeys:
+            if self.__isAborted:
+                self.__abortedKeys.add(key)
+            self.__validations[key] = False
+            return False
+
+        if "result" == key and self.__stream is not None:
+            self.__validations[key] = True
+            return True
+
         items = json.loads(json.dumps(data, default=vars))
 
-        self.__validateWith(key, items, depth)
+        yield self.__validateWith(key, items, depth)
 
         # unnecessary because data is stored already.
         if key in data.keys():
@@ -798,25 +1794,46 @@ class ServiceBase(ABC):
             deps = self.__getClosureDependencies(callback)
 
             for dep in deps:
-                if not self.__validate(dep, depth):
+                if not (yield self.__validate(dep, depth)):
                     self.__validations[key] = False
 
         if True == self.__validations[key]:
             for callbackKey in orderedCallbackKeys:
-                if not re.match("@defer$", callbackKey):
+                if not re.search(self.DEFER_CALLBACK_EXP, callbackKey):
                     callback = callbacks[callbackKey]
                     self.__resolve(callback)
 
         if False == self.__validations[key]:
             return False
 
+        self.__submitCpuBoundLoaders()
+
         return True
 
+    def __validateAll(self):
+        self.__isPrefetching = not self.__isLazy
+        self.__submitCpuBoundLoaders()
+
+        for key in self.getInputs().keys():
+            yield self.__validate(key)
+
+        for cls in self.getAllRuleLists().keys():
+            for key in self.getAllRuleLists()[cls].keys():
+                yield self.__validate(key)
+
+        for key in self.getAllLoaders().keys():
+            if self.__isLazy and key != "result":
+                continue
+            yield self.__validate(key)
+
+        self.__isPrefetching = False
+
     def __validateWith(self, key, items, depth):
         mainKey = key.split(".")[0]
 
         for cls in [*self.getAllTraits(), self.__class__]:
-            names = dict()
+            nameKeys = []
+            deps = dict()
             ruleLists = self.__getRelatedRuleLists(key, cls)
             ruleLists = self.__filterAvailableExpandedRuleLists(
                 cls,
@@ -825,57 +1842,65 @@ class ServiceBase(ABC):
             )
 
             for k, ruleList in ruleLists.items():
-                for j, rule in enumerate(ruleList):
+                availableRuleList = []
+                for rule in ruleList:
+                    isAvailable = True
                     depKeysInRule = cls.getDependencyKeysInRule(rule)
                     for depKey in depKeysInRule:
-                        if re.match(r"\.\*", depKey):
+                        depPath = getCompiledPath(depKey)
+                        if depPath.wildcardIndex != -1:
                             raise Exception(
                                 "wildcard(*) key can't exists in rule dependency in "
                                 + cls.__name__
                             )
 
-                        depKeySegs = depKey.split(".")
-                        depVal = dict(items)
-                        hasDepVal = True
-                        while not depKeySegs:
-                            seg = depKeySegs.pop(0)
-                            if seg not in depVal:
-                                hasDepVal = False
-
-                                break
-
-                            depVal = depVal[seg]
+                        if not (yield self.__validate(depKey, depth)):
+                            self.__validations[key] = False
+                            isAvailable = False
+                        elif not depPath.has(self.__data):
+                            isAvailable = False
+                        else:
+                            deps[depKey] = depPath.get(self.__data)
 
-                        if not hasDepVal:
-                            del ruleLists[k][j]
+                        nameKeys.append(depKey)
 
-                        if not self.__validate(depKey, depth):
-                            self.__validations[key] = False
-                            del ruleLists[k][j]
+                    if isAvailable:
+                        availableRuleList.append(rule)
 
-                        names[depKey] = self.resolveBindName("{{" + depKey + "}}")
+                ruleLists[k] = availableRuleList
 
-            for k, ruleList in ruleLists.items():
-                if ruleList:
-                    names[k] = self.resolveBindName("{{" + k + "}}")
+            if self.__isAborted:
+                self.__validations[key] = False
+                self.__abortedKeys.add(key)
+                return False
 
+            nameKeys += [k for k, ruleList in ruleLists.items() if ruleList]
+            names = self.__getNameResolver(nameKeys)
             messages = self.getValidationErrorTemplateMessages()
 
             for ruleKey, ruleList in ruleLists.items():
-                errorLists = self.getValidationErrors(
-                    items,
-                    {(ruleKey): ruleList},
-                    names,
-                    messages,
+                errorLists = (
+                    self.getValidationErrors(
+                        items, {(ruleKey): ruleList}, names, messages, deps
+                    )
+                    if deps
+                    else self.getValidationErrors(
+                        items, {(ruleKey): ruleList}, names, messages
+                    )
                 )
 
                 if errorLists:
-                    if ruleKey not in self.__errors:
-                        self.__errors[ruleKey] = []
+                    errorList = [*self.__errors.get(ruleKey, [])]
 
                     for error in errorLists[ruleKey]:
-                        if error not in self.__errors[ruleKey]:
-                            self.__errors[ruleKey].append(error)
+                        if error not in errorList:
+                            errorList.append(error)
+
+                    if self.__isFailFast:
+                        errorList = errorList[:1]
+                        self.__isAborted = True
+
+                    self.__setErrors(ruleKey, errorList)
 
                     self.__validations[key] = False
                     return False
@@ -0,0 +1,109 @@
+import json
+import re
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Dict, List, Tuple
+
+from src.identity_cache import IdentityCache
+
+PLACEHOLDER_EXP = re.compile(r"\{\{\s*([^{}]+?)\s*\}\}")
+
+
+class RuleTemplate:
+    def __init__(self, rule: Any, maxSize: int = 128):
+        self.rule = rule
+        self.deps: List[str] = []
+        self.slots: List[Tuple[Tuple[Any, ...], str]] = []
+        self.maxSize = maxSize
+        self.__rendered: OrderedDict = OrderedDict()
+        self.__lock = threading.Lock()
+        self.__collect(rule, ())
+
+    def render(self, values: Dict[str, Any]) -> Any:
+        if not self.slots:
+            return self.rule
+
+        try:
+            cacheKey = json.dumps([values.get(dep) for dep in self.deps])
+        except (TypeError, ValueError):
+            return self.__substitute(values)
+
+        with self.__lock:
+            if cacheKey in self.__rendered:
+                self.__rendered.move_to_end(cacheKey)
+                return self.__rendered[cacheKey]
+
+        rule = self.__substitute(values)
+
+        with self.__lock:
+            self.__rendered[cacheKey] = rule
+            while len(self.__rendered) > self.maxSize:
+                self.__rendered.popitem(last=False)
+
+        return rule
+
+    def __collect(self, value: Any, path: Tuple[Any, ...]):
+        if isinstance(value, dict):
+            for k, v in value.items():
+                self.__collect(v, (*path, k))
+        elif isinstance(value, list):
+            for i, v in enumerate(value):
+                self.__collect(v, (*path, i))
+        elif isinstance(value, str):
+            keys = PLACEHOLDER_EXP.findall(value)
+            if keys:
+                self.slots.append((path, value))
+                for key in keys:
+                    if key not in self.deps:
+                        self.deps.append(key)
+
+    def __fill(self, template: str, values: Dict[str, Any]) -> Any:
+        matches = PLACEHOLDER_EXP.fullmatch(template)
+
+        if matches:
+            return values.get(matches[1])
+
+        return PLACEHOLDER_EXP.sub(lambda m: str(values.get(m[1])), template)
+
+    def __substitute(self, values: Dict[str, Any]) -> Any:
+        rule = self.__copy(self.rule)
+        copied = {id(rule)}
+
+        for path, template in self.slots:
+            node = rule
+            for seg in path[:-1]:
+                child = node[seg]
+                if id(child) not in copied:
+                    child = self.__copy(child)
+                    copied.add(id(child))
+                    node[seg] = child
+                node = child
+            node[path[-1]] = self.__fill(template, values)
+
+        return rule
+
+    @staticmethod
+    def __copy(value: Any) -> Any:
+        return dict(value) if isinstance(value, dict) else list(value)
+
+
+@lru_cache(maxsize=1024)
+def compileRuleTemplate(fingerprint: str) -> RuleTemplate:
+    return RuleTemplate(json.loads(fingerprint))
+
+
+def getRuleTemplate(rule: Any) -> RuleTemplate:
+    return _templates.get(rule, _getRuleTemplate)
+
+
+def _getRuleTemplate(rule: Any) -> RuleTemplate:
+    try:
+        fingerprint = json.dumps(rule, sort_keys=True)
+    except (TypeError, ValueError):
+        return RuleTemplate(rule)
+
+    return compileRuleTemplate(fingerprint)
+
+
+_templates = IdentityCache()
@@ -0,0 +1,110 @@
+import re
+from functools import lru_cache
+from typing import Any, Callable, Dict, List
+
+
+class ValidationErrorTemplate:
+    def __init__(self, template: str):
+        self.segments = re.split(r"\{property\}", template)
+
+    def render(self, property: str) -> str:
+        return property.join(self.segments)
+
+
+@lru_cache(maxsize=None)
+def getValidationErrorTemplate(template: str) -> ValidationErrorTemplate:
+    return ValidationErrorTemplate(template)
+
+
+class ValidationError:
+    def __init__(
+        self,
+        keyword: str,
+        path: List[Any],
+        key: str,
+        message: str,
+        names: Dict[str, str] | Callable[[str], str],
+        messages: Dict[str, str],
+    ):
+        self.keyword = keyword
+        self.path = path
+        self.key = key
+        self.rawMessage = message
+        self.__names = names
+        self.__messages = messages
+        self.__message = None
+        self.__name = None
+
+    def __eq__(self, other):
+        if not isinstance(other, ValidationError):
+            return NotImplemented
+
+        return (self.keyword, self.path, self.key, self.rawMessage) == (
+            other.keyword,
+            other.path,
+            other.key,
+            other.rawMessage,
+        )
+
+    def __hash__(self):
+        return hash((self.keyword, tuple(self.path), self.key, self.rawMessage))
+
+    def __repr__(self):
+        return "ValidationError(" + self.key + ", " + repr(self.rawMessage) + ")"
+
+    def __str__(self):
+        return self.getMessage()
+
+    def getMessage(self) -> str:
+        if self.__message is not None:
+            return self.__message
+
+        if self.keyword in self.__messages:
+            template = getValidationErrorTemplate(self.__messages[self.keyword])
+            self.__message = template.render(self.getName())
+        else:
+            self.__message = self.rawMessage
+
+        return self.__message
+
+    def getName(self) -> str:
+        if self.__name is not None:
+            return self.__name
+
+        propertyPath = [str(x) for x in self.getPropertyPath()]
+        mainKey = propertyPath[0] if propertyPath else self.key.split(".")[0]
+        subKey = "][".join(propertyPath[1:])
+
+        if callable(self.__names):
+            name = self.__names(mainKey)
+        else:
+            name = self.__names[mainKey] if mainKey in self.__names else mainKey
+
+        self.__name = re.sub(r"\[\.\.\.\]", "[" + subKey + "]" if subKey else "", name)
+
+        return self.__name
+
+    def getPropertyPath(self) -> List[Any]:
+        if "required" == self.keyword:
+            matches = re.match("'(.+)' is a required property", self.rawMessage)
+            if matches:
+                return [*self.path, matches[1]]
+
+        return self.path
+
+
+def renderTotalErrors(totalErrors: Dict[str, Any]) -> Dict[str, Any]:
+    rendered: Dict[str, Any] = {}
+    stack = [(totalErrors, rendered)]
+
+    while stack:
+        errors, target = stack.pop()
+
+        for key, value in errors.items():
+            if isinstance(value, dict):
+                target[key] = {}
+                stack.append((value, target[key]))
+            else:
+                target[key] = [str(error) for error in value]
+
+    return rendered
@@ -1,6 +1,30 @@
+import json
+from functools import lru_cache
+
 import jsonschema
 from jsonschema.validators import extend
 
+from src.identity_cache import IdentityCache
+
+Validator = extend(jsonschema.Draft202012Validator)
+
+
+@lru_cache(maxsize=1024)
+def compileValidator(fingerprint: str) -> jsonschema.Draft202012Validator:
+    return Validator(json.loads(fingerprint))
+
 
 def getValidator(schema) -> jsonschema.Draft202012Validator:
-    return extend(jsonschema.Draft202012Validator)(schema)
+    return _validators.get(schema, _getValidator)
+
+
+def _getValidator(schema) -> jsonschema.Draft202012Validator:
+    try:
+        fingerprint = json.dumps(schema, sort_keys=True)
+    except (TypeError, ValueError):
+        return Validator(schema)
+
+    return compileValidator(fingerprint)
+
+
+_validators = IdentityCache()
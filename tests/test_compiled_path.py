@@ -0,0 +1,26 @@
+import os
+import sys
+
+sys.path.append(os.getcwd())
+
+from src.compiled_path import CompiledPath, getCompiledPath
+
+
+def test_compiled_path():
+    data = {"a": {"b": [{"c": 1}, {"c": 2}]}}
+
+    assert getCompiledPath("a.b.1.c") is getCompiledPath("a.b.1.c")
+    assert getCompiledPath("a.b.1.c").get(data) == 2
+    assert getCompiledPath("a.b.0").get(data) is data["a"]["b"][0]
+    assert getCompiledPath("a.b.2.c").get(data) is None
+    assert getCompiledPath("a.d").has(data) == False
+    assert getCompiledPath("a.b").prefixes == ("a", "a.b")
+
+
+def test_compiled_path_expand():
+    data = {"a": {"b": [{"c": 1}, {"c": 2}]}, "d": {"e": 1, "f": 2}}
+
+    assert CompiledPath("a.b.*.c").expand(data) == ["a.b.0.c", "a.b.1.c"]
+    assert CompiledPath("d.*").expand(data) == ["d.e", "d.f"]
+    assert CompiledPath("x.*").expand(data) == []
+    assert CompiledPath("d.e").expand(data) == ["d.e"]
@@ -0,0 +1,47 @@
+import json
+import os
+import sys
+
+sys.path.append(os.getcwd())
+
+from src.critical_path import TimingProfiler, analyzeCriticalPath
+from src.service import Service
+
+
+def test_analyze_critical_path():
+    graph = {"a": [], "b": ["a"], "c": [], "result": ["b", "c"]}
+    timings = {"a": 3.0, "b": 2.0, "c": 4.0, "result": 1.0}
+    report = analyzeCriticalPath(graph, timings)
+
+    assert report.criticalPath == ["a", "b", "result"]
+    assert report.criticalPathTime == 6.0
+    assert report.sequentialTime == 10.0
+    assert report.loaders["a"]["slack"] == 0.0
+    assert report.loaders["c"]["slack"] == 1.0
+    assert report.loaders["c"]["ifCachedSpeedup"] == 10.0 / 6.0
+    assert report.loaders["c"]["ifAsyncSpeedup"] == 10.0 / 6.0
+    assert json.loads(report.toJson())["parallelSpeedup"] == 10.0 / 6.0
+    assert "critical path: a -> b -> result" in report.toText()
+
+
+def test_timing_profiler():
+    class Service1(Service):
+        def getLoaders():
+            def aaa():
+                import time
+
+                time.sleep(0.02)
+                return "aaa"
+
+            def result(aaa):
+                return aaa
+
+    profiler = TimingProfiler()
+    service = Service1().setWith()
+
+    assert profiler.profile(service) == {"result": "aaa"}
+    assert profiler.timings["aaa"] >= 0.02
+
+    report = analyzeCriticalPath(service.getDependencyGraph(), profiler.timings)
+
+    assert report.criticalPath == ["aaa", "result"]
@@ -0,0 +1,29 @@
+import os
+import sys
+
+sys.path.append(os.getcwd())
+
+from src.identity_cache import IdentityCache
+
+
+def test_identity_cache():
+    calls = []
+
+    def factory(value):
+        calls.append(value)
+        return len(value)
+
+    cache = IdentityCache(maxSize=2)
+    key1 = {"a": 1}
+    key2 = {"a": 1}
+
+    assert cache.get(key1, factory) == 1
+    assert cache.get(key1, factory) == 1
+    assert cache.get(key2, factory) == 1
+    assert len(calls) == 2
+
+    cache.get({"b": 1, "c": 2}, factory)
+
+    assert cache.size() == 2
+    assert cache.get(key1, factory) == 1
+    assert len(calls) == 4
@@ -0,0 +1,66 @@
+import json
+import os
+import sys
+
+sys.path.append(os.getcwd())
+
+from src.load_test import (
+    LoadTest,
+    LoadTestReport,
+    getPercentile,
+    getStandInCatalog,
+    main,
+)
+
+
+def test_get_percentile():
+    values = [float(i) for i in range(1, 1001)]
+
+    assert getPercentile(values, 50) == 501.0
+    assert getPercentile(values, 99) == 991.0
+    assert getPercentile(values, 99.9) == 1000.0
+    assert getPercentile([], 50) == 0.0
+
+
+def test_load_test():
+    report = LoadTest(getStandInCatalog(0.001), concurrency=4, requests=10).run()
+    stats = report.toDict()["services"]
+
+    assert [*stats.keys()] == ["user", "feed"]
+    assert stats["user"]["count"] == 10
+    assert stats["feed"]["p50"] >= 0.001
+    assert stats["feed"]["p50"] <= stats["feed"]["p999"]
+    assert "user: count=10" in report.toText()
+
+
+def test_load_test_report_compare():
+    report = LoadTestReport(
+        {"user": {"throughput": 100.0, "p50": 0.01, "p95": 0.02, "p99": 0.05}}
+    )
+    baseline = {
+        "services": {
+            "user": {"throughput": 200.0, "p50": 0.01, "p95": 0.01, "p99": 0.05},
+            "missing": {"p50": 0.01},
+        }
+    }
+
+    assert report.compare(baseline, 0.2) == [
+        "user p95 0.020000s > baseline 0.010000s",
+        "user throughput 100.00/s < baseline 200.00/s",
+    ]
+    assert report.compare(baseline, 1.5) == []
+
+
+def test_load_test_main(tmp_path, capsys):
+    baselinePath = tmp_path / "baseline.json"
+    args = ["--requests", "4", "--concurrency", "2", "--latency", "0"]
+
+    assert main([*args, "--write-baseline", str(baselinePath)]) == 0
+    assert "user" in json.loads(baselinePath.read_text())["services"]
+
+    baselinePath.write_text(
+        json.dumps({"services": {"user": {"p50": 0.0, "throughput": 1e12}}})
+    )
+
+    assert main([*args, "--baseline", str(baselinePath)]) == 1
+    assert "regression: user p50" in capsys.readouterr().err
@@ -0,0 +1,35 @@
+import os
+import sys
+
+sys.path.append(os.getcwd())
+
+from src.validation.rule_template import getRuleTemplate
+
+
+def test_rule_template():
+    rule = {
+        "properties": {
+            "a": {"minimum": "{{min}}", "enum": [1, "{{ max }}"]},
+            "b": {"type": "string", "description": "between {{min}} and {{max}}"},
+        }
+    }
+    template = getRuleTemplate(rule)
+
+    assert getRuleTemplate({**rule}) is template
+    assert sorted(template.deps) == ["max", "min"]
+
+    rendered = template.render({"min": 1, "max": 9})
+
+    assert rendered["properties"]["a"] == {"minimum": 1, "enum": [1, 9]}
+    assert rendered["properties"]["b"]["description"] == "between 1 and 9"
+    assert template.render({"min": 1, "max": 9}) is rendered
+    assert template.render({"min": 2, "max": 9}) is not rendered
+    assert template.rule["properties"]["a"]["minimum"] == "{{min}}"
+
+
+def test_rule_template_without_placeholders():
+    rule = {"properties": {"a": {"type": "number"}}}
+    template = getRuleTemplate(rule)
+
+    assert template.deps == []
+    assert template.render({}) is template.rule
@@ -1,11 +1,19 @@
 import json
 import os
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import List
 
 sys.path.append(os.getcwd())
 
+from src.binder import getBinder
+from src.defer_executor import DeferExecutor
+from src.memory_profiler import MemoryProfiler
+from src.result_cache import ResultCache
 from src.service import Service
+from src.service_base import ServiceBase
+from src.validation.validator import getValidator
 
 
 def test_callback():
@@ -96,520 +104,2015 @@ def test_callback_with_dependency():
     assert "bcde" not in dict(service2.getData()["result"]).keys()
 
 
-def test_load_data_from_input():
-
-    class ParentService(Service):
+def test_concurrent_runs():
+    class ChildService(Service):
         def getBindNames():
-            return {"result": "name for result"}
-
-        def getCallbacks():
-            pass
+            return {"aaa": "name for aaa"}
 
         def getLoaders():
-            pass
+            def result(aaa):
+                return aaa * 2
 
         def getRuleLists():
-            return {"result": {"required": ["result"]}}
+            return {"aaa": {"properties": {"aaa": {"minimum": 0}}}}
 
-    service = ParentService().setWith({"result": "result value"})
-    service.run()
+    class ParentService(Service):
+        def getLoaders():
+            def result(items):
+                return sum(items)
 
-    assert service.getTotalErrors() == {}
+    class OtherService(Service):
+        def getLoaders():
+            def result():
+                return "result value"
 
+    successes = []
+    failures = []
+    ParentService.addOnSuccessCallback(lambda: successes.append(True))
+    ParentService.addOnFailCallback(lambda: failures.append(True))
 
-def test_load_data_from_input_child_batch_service():
+    def runService(i):
+        started = []
+        values = [i, i + 1, -1 if i % 10 == 0 else i + 2]
+        service = ParentService().setWith(
+            {"items": [[ChildService, {"aaa": v}] for v in values]}
+        )
+
+        with ParentService.withLifecycleCallbacks(onStart=lambda: started.append(i)):
+            response = service.run()
+
+        OtherService().setWith().run()
+
+        return i, started, response
+
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        results = [*executor.map(runService, range(300))]
+
+    for i, started, response in results:
+        assert started == [i]
+        if i % 10 == 0:
+            assert [*response["errors"].keys()] == ["items.2"]
+        else:
+            assert response == {"result": (3 * i + 3) * 2}
+
+    assert len(successes) == 270
+    assert len(failures) == 30
+
+
+class CpuBoundService(Service):
+    def getLoaderOptions():
+        return {"digest": {"cpuBound": True}}
+
+    def getLoaders():
+        def digest(text):
+            import hashlib
+            import os
+
+            return [hashlib.sha256(text.encode()).hexdigest(), os.getpid()]
+
+        def result(digest):
+            return digest
+
+
+def test_cpu_bound_loader():
+    service = CpuBoundService().setWith({"text": "aaaa"})
+    response = service.run()
+
+    assert response["result"][0] == (
+        "61be55a8e2f6b4e172338bddf184d6dbee29c98853e0a0485ecee7f27b9af0b4"
+    )
+    assert response["result"][1] != os.getpid()
+
+
+class CpuBoundRuleService(Service):
+    def getBindNames():
+        return {"text": "name for text"}
+
+    def getLoaderOptions():
+        return {"digest": {"cpuBound": True}}
+
+    def getLoaders():
+        def digest():
+            return "digest value"
+
+        def result(text):
+            return text
+
+    def getRuleLists():
+        return {"text": {"properties": {"text": {"minLength": 2}}}}
+
+
+def test_cpu_bound_loader_lazy_and_aborted():
+    from concurrent.futures import Future
+
+    class PendingExecutor:
+        def __init__(self) -> None:
+            self.futures: List[Future] = []
+
+        def submit(self, *args):
+            self.futures.append(Future())
+            return self.futures[-1]
+
+    executor = Service.getProcessPoolExecutor()
+    pendingExecutor = PendingExecutor()
+    Service.setProcessPoolExecutor(pendingExecutor)
+
+    try:
+        service = CpuBoundRuleService().setWith({"text": "aaaa"})
+        service.setLazy(True)
+
+        assert service.run() == {"result": "aaaa"}
+        assert pendingExecutor.futures == []
+
+        service = CpuBoundRuleService().setWith({"text": "aaaa"})
+
+        assert service.validateKeys(["text"]) == {}
+        assert pendingExecutor.futures == []
+
+        service = CpuBoundRuleService().setWith({"text": "a"})
+        service.setFailFast(True)
+
+        assert "text" in service.run()["errors"]
+        assert len(pendingExecutor.futures) == 1
+        assert pendingExecutor.futures[0].cancelled()
+    finally:
+        Service.setProcessPoolExecutor(executor)
+
+
+def test_cpu_bound_loader_with_unpicklable_service():
+    class Service1(Service):
+        def getLoaderOptions():
+            return {"result": {"cpuBound": True}}
+
+        def getLoaders():
+            def result():
+                return "result value"
+
+    service = Service1().setWith()
+
+    try:
+        service.run()
+        assert False
+    except Exception as e:
+        assert "can't be pickled" in str(e)
+
+
+def test_deadline():
     class ChildService(Service):
         def getBindNames():
-            return {}
+            return {"result": "child result"}
 
         def getLoaders():
             def result():
+                import time
+
+                time.sleep(0.2)
                 return "child result value"
 
     class ParentService(Service):
         def getBindNames():
-            return {
-                "result": "parent result name",
-            }
+            return {"result": "parent result"}
 
         def getLoaders():
             def result():
                 pass
 
-        def getRuleLists():
-            return {"result": {"required": ["result"]}}
-
-    service = ParentService().setWith(
-        {
-            "result": [
-                [ChildService],
-                [ChildService],
-            ]
-        }
-    )
+    service = ParentService().setWith({"result": [[ChildService], [ChildService]]})
+    service.setDeadline(0.3)
     service.run()
 
-    assert service.getTotalErrors() == {}
-    assert service.getData()["result"] == [
-        "child result value",
-        "child result value",
-    ]
+    assert service.getTotalErrors() == {
+        "result.1": {"result": ["'child result' is timed out"]}
+    }
 
 
-def test_load_data_from_input_service():
+def test_deadline_pooled_child():
     class ChildService(Service):
+        POOL_SIZE = 1
+
         def getLoaders():
             def result():
                 return "child result value"
 
     class ParentService(Service):
-        def getBindNames():
-            return {
-                "result": "parent result name",
-            }
+        def getLoaders():
+            def result(items):
+                return items
 
-        def getRuleLists():
-            return {"result": {"required": ["result"]}}
+    service = ParentService().setWith({"items": [[ChildService]]})
+    service.setDeadline(0.3)
 
-    service = ParentService().setWith({"result": [ChildService]})
-    service.run()
-    value = service.getData()["result"]
+    assert service.run() == {"result": ["child result value"]}
 
-    assert value == "child result value"
+    service.release()
+    time.sleep(0.4)
+
+    service = ParentService().setWith({"items": [[ChildService]]})
+
+    assert service.run() == {"result": ["child result value"]}
     assert service.getTotalErrors() == {}
 
 
-def test_load_data_from_loader():
-    class Service1(Service):
+def test_deep_child_chain():
+    class ChainService(Service):
+        def __init__(self) -> None:
+            super().__init__()
+            self.calls = calls
+            self.chainService = ChainService
+
         def getBindNames():
-            return {
-                "result": "name for result",
-            }
+            return {"child": "name for child", "depth": "name for depth"}
+
+        def getCallbacks():
+            def result__defer(result, calls):
+                calls.append(result)
 
         def getLoaders():
-            def result():
-                return "result value"
+            def child(chainService, depth):
+                return [chainService, {"depth": depth - 1}] if depth else 0
 
-        def getRuleLists():
-            return {
-                "result": {
-                    "required": ["result"],
-                    "properties": {"result": {"type": "string"}},
-                }
-            }
+            def result(child):
+                return child + 1
 
-    service1 = Service1().setWith()
-    service1.run()
+    calls: List[int] = []
+    service = ChainService().setWith({"depth": 5000})
 
-    assert service1.getTotalErrors() == {}
+    assert service.run() == {"result": 5001}
+    assert service.getTotalErrors() == {}
+    assert len(calls) == 5001
+    assert [*service.getChilds().keys()] == ["child"]
+
+    service.release()
 
-    class Service2(Service):
-        def getBindNames():
-            return {
-                "result": "name for result",
-            }
 
+def test_circular_dependency():
+    class Service1(Service):
         def getLoaders():
-            def result():
-                return ["aaa", "bbb", "ccc"]
+            def aaa(bbb):
+                return bbb
 
-        def getRuleLists():
-            return {
-                "result": {
-                    "required": ["result"],
-                    "properties": {"result": {"type": "string"}},
-                }
-            }
+            def bbb(aaa):
+                return aaa
 
-    service2 = Service2().setWith()
-    service2.run()
+            def result(aaa):
+                return aaa
 
-    assert service2.getTotalErrors() != {}
+    try:
+        Service1().setWith().run()
+        assert False
+    except Exception as e:
+        assert "circular reference[aaa|bbb|aaa]" in str(e)
 
 
-def test_load_data_from_loader_with_default_value():
+def test_defer_callback():
     class Service1(Service):
-        def getBindNames():
-            return {}
+        def __init__(self) -> None:
+            super().__init__()
+            self.calls: List[str] = []
 
-        def getLoaders():
-            def result(key1="abcd"):
-                return key1
+        def getCallbacks():
+            def result__cb1(calls):
+                calls.append("cb1")
 
-        def getRuleLists():
-            return {}
+            def result__cb2__defer(result, calls):
+                calls.append("cb2 " + result)
+
+        def getLoaders():
+            def result(calls):
+                calls.append("result")
+                return "result value"
 
     service1 = Service1().setWith()
     service1.run()
 
-    assert service1.getTotalErrors() == {}
-    assert service1.getData()["result"] == "abcd"
-
-
-def test_load_data_from_loader_with_dependency():
-    class Service1(Service):
-        def getBindNames():
-            return {
-                "result": "name for result",
-            }
+    assert service1.calls == ["result", "cb1", "cb2 result value"]
 
-        def getLoaders():
-            def aaa():
-                return "aaaaaa"
+    errors = []
+    executor = DeferExecutor(onError=lambda e, callback: errors.append(e))
+    Service.setDeferExecutor(executor)
 
-            def result(aaa):
-                return aaa + " value"
+    try:
+        service2 = Service1().setWith()
+        service2.run()
 
-        def getRuleLists():
-            return {
-                "result": {
-                    "required": ["result"],
-                    "properties": {"result": {"type": "string"}},
-                }
-            }
+        assert executor.flush(1)
+        assert service2.calls == ["result", "cb1", "cb2 result value"]
 
-    service1 = Service1().setWith()
-    service1.run()
+        executor.submit(lambda: 1 / 0)
 
-    assert service1.getTotalErrors() == {}
-    assert service1.getData()["result"] == "aaaaaa value"
+        assert executor.flush(1)
+        assert isinstance(errors[0], ZeroDivisionError)
+    finally:
+        Service.setDeferExecutor(None)
+        executor.shutdown()
 
 
-def test_load_data_from_property():
+def test_fail_fast():
     class Service1(Service):
         def __init__(self) -> None:
             super().__init__()
-            self.key1: str = "aaa"
+            self.calls: List[str] = []
 
         def getBindNames():
             return {
-                "key1": "name for key1",
-                "result": "name for result",
+                "aaa": "name for aaa",
+                "bbb": "name for bbb",
             }
 
         def getLoaders():
-            def result(key1):
-                return key1
+            def result(calls):
+                calls.append("result")
+                return "result value"
 
         def getRuleLists():
             return {
-                "result": {
-                    "required": ["result"],
-                    "properties": {"result": {"type": "string"}},
-                }
+                "aaa": {"required": ["aaa"]},
+                "bbb": {"required": ["bbb"]},
             }
 
     service1 = Service1().setWith()
     service1.run()
 
-    assert service1.getTotalErrors() == {}
+    assert len(service1.getTotalErrors()) == 2
+    assert service1.calls == ["result"]
 
-    class Service2(Service):
-        def __init__(self) -> None:
-            super().__init__()
-            self.key1: List[str] = ["aaa", "bbb", "ccc"]
+    service2 = Service1().setWith()
+    service2.setFailFast()
+    response = service2.run()
 
+    assert [*response["errors"].keys()] == ["aaa"]
+    assert len(response["errors"]["aaa"]) == 1
+    assert service2.calls == []
+
+
+def test_fail_fast_child_service():
+    class ChildService(Service):
         def getBindNames():
-            return {
-                "key1": "name for key1",
-                "result": "name for result",
-            }
+            return {"aaa": "name for aaa"}
+
+        def getRuleLists():
+            return {"aaa": {"required": ["aaa"]}}
+
+    class ParentService(Service):
+        def __init__(self) -> None:
+            super().__init__()
+            self.childService = ChildService
 
         def getLoaders():
-            def result(key1):
-                return key1
+            def result(childService):
+                return [
+                    [childService],
+                    [childService],
+                ]
 
-        def getRuleLists():
-            return {
-                "result": {
-                    "required": ["result"],
-                    "properties": {"result": {"type": "string"}},
-                }
-            }
+    service = ParentService().setWith()
+    service.setFailFast()
+    response = service.run()
 
-    service2 = Service2().setWith()
-    service2.run()
+    assert [*response["errors"].keys()] == ["result.0"]
+    assert [*service.getChilds().keys()] == ["result.0"]
 
-    assert service2.getTotalErrors() != {}
 
+def test_fan_out():
+    import threading
 
-def test_load_data_from_property_in_dependency():
-    class Service1(Service):
+    lock = threading.Lock()
+    inFlight = {"current": 0, "max": 0}
+    deferred = []
+
+    class ChildService(Service):
         def __init__(self) -> None:
             super().__init__()
-            self.aaa: str = "aaaaaa"
+            self.deferred = deferred
+            self.inFlight = inFlight
+            self.lock = lock
 
         def getBindNames():
-            return {
-                "result": "name for result",
-            }
+            return {"index": "name for index", "result": "name for result"}
+
+        def getCallbacks():
+            def result__defer(result, deferred):
+                deferred.append(result)
 
         def getLoaders():
-            def result(aaa):
-                return aaa + " value"
+            def result(index, inFlight, lock):
+                import time
 
-        def getRuleLists():
-            return {
-                "result": {
-                    "required": ["result"],
-                    "properties": {"result": {"type": "string"}},
-                }
-            }
+                with lock:
+                    inFlight["current"] += 1
+                    inFlight["max"] = max(inFlight["max"], inFlight["current"])
+                time.sleep(0.02)
+                with lock:
+                    inFlight["current"] -= 1
+                return index * 10
 
-    service1 = Service1().setWith()
-    service1.run()
+        def getRuleLists():
+            return {"index": {"properties": {"index": {"maximum": 16}}}}
 
-    assert service1.getTotalErrors() == {}
-    assert service1.getData()["result"] == "aaaaaa value"
+    class ParentService(Service):
+        MAX_CHILDS_IN_FLIGHT = 4
 
+        def __init__(self) -> None:
+            super().__init__()
+            self.childService = ChildService
 
-def test_load_data_key_invaild_because_of_children_rule():
-    class Service1(Service):
         def getBindNames():
-            return {
-                "result": "result[...] name",
+            return {"result": "name for result"}
+
+        def getLoaders():
+            def result(childService, size):
+                return [[childService, {"index": i}] for i in range(size)]
+
+    service = ParentService().setWith({"size": 12})
+    service.run()
+
+    assert service.getData()["result"] == [i * 10 for i in range(12)]
+    assert inFlight["max"] == 1
+    assert deferred == [i * 10 for i in range(12)] == [i * 10 for i in range(12)]
+    assert all(not isinstance(child, Service) for child in service.getChilds().values())
+
+    service = ParentService().setWith({"size": 20})
+    service.run()
+
+    assert service.hasTotalErrors()
+    assert [*service.getTotalErrors().keys()] == [
+        "result.17",
+        "result.18",
+        "result.19",
+    ]
+
+    profiler = MemoryProfiler()
+    profiler.profile(ParentService().setWith({"size": 8}))
+    tree = profiler.getReport()["tree"]
+    nodes = {x["kind"] + " " + x["name"]: x for x in tree[0]["childs"]}
+
+    assert len(tree) == 1
+    assert [*nodes.keys()] == [
+        "loader result",
+        *["child result." + str(i) for i in range(8)],
+    ]
+
+
+def test_filter_present_related_rule():
+    rule = {
+        "properties": {
+            "a": {"type": "object", "required": ["b"]},
+            "c": {"type": "string"},
+        }
+    }
+    filtered = Service.filterPresentRelatedRule(rule)
+
+    assert filtered == {"properties": {"a": {"required": ["b"]}, "c": {}}}
+    assert Service.filterPresentRelatedRule({**rule}) is filtered
+    assert rule["properties"]["c"] == {"type": "string"}
+    assert Service.filterPresentRelatedRule({"type": "string"}) is None
+    assert getValidator(rule) is getValidator({**rule})
+
+
+def test_rule_lists_cached():
+    class Service1(Service):
+        def getRuleLists():
+            return {"aaa": {"properties": {"aaa": {"minimum": "{{bbb}}"}}}}
+
+    ruleLists = Service1.getAllRuleLists()
+    rule = ruleLists[Service1]["aaa"][0]
+    ruleLists[Service1]["ccc"] = []
+
+    assert Service1.getAllRuleLists()[Service1]["aaa"][0] is rule
+    assert "ccc" not in Service1.getAllRuleLists()[Service1]
+    assert Service1.getDependencyKeysInRule(rule) == ["bbb"]
+
+
+def test_hedged_loader():
+    class FakeBackend:
+        def __init__(self, latencies: List[float]) -> None:
+            self.latencies = latencies
+
+        def fetch(self):
+            import time
+
+            time.sleep(self.latencies.pop(0))
+            return "backend value"
+
+    class Service1(Service):
+        def __init__(self) -> None:
+            super().__init__()
+            self.backend = FakeBackend([1.0, 0.01])
+
+        def getBindNames():
+            return {}
+
+        def getLoaderOptions():
+            return {"result": {"idempotent": True, "hedge": True, "hedgeDelay": 0.05}}
+
+        def getLoaders():
+            def result(backend):
+                return backend.fetch()
+
+    service = Service1()
+    start = time.monotonic()
+    service.run()
+
+    assert time.monotonic() - start < 0.5
+    assert service.getData()["result"] == "backend value"
+    assert service.getLoaderStats()["result"]["attempts"] == 2
+
+    from contextvars import ContextVar
+
+    var: ContextVar = ContextVar("var")
+
+    class Service2(Service):
+        def __init__(self) -> None:
+            super().__init__()
+            self.var = var
+
+        def getLoaderOptions():
+            return {"result": {"idempotent": True, "hedge": True, "hedgeDelay": 0.05}}
+
+        def getLoaders():
+            def result(var):
+                return var.get("unset")
+
+    token = var.set("caller value")
+
+    try:
+        assert Service2().setWith().run() == {"result": "caller value"}
+    finally:
+        var.reset(token)
+
+
+def test_iter_run():
+    class ChildService(Service):
+        def getBindNames():
+            return {"aaa": "name for aaa"}
+
+        def getLoaders():
+            def result(aaa):
+                return aaa * 10
+
+        def getRuleLists():
+            return {"aaa": {"properties": {"aaa": {"minimum": 1}}}}
+
+    class ParentService(Service):
+        def __init__(self) -> None:
+            super().__init__()
+            self.childService = ChildService
+
+        def getLoaders():
+            def result(childService):
+                for i in range(3):
+                    yield [childService, {"aaa": i}]
+
+    service1 = ParentService().setWith()
+    bodies = [*service1.iterRun()]
+
+    assert len(bodies) == 3
+    assert "aaa" in bodies[0]["errors"]
+    assert bodies[1] == {"result": 10}
+    assert bodies[2] == {"result": 20}
+    assert service1.getChilds() == {}
+
+    service2 = ParentService().setWith()
+    response = service2.run()
+
+    assert "result.0" in response["errors"]
+
+
+def test_iter_run_callbacks():
+    class ChildService(Service):
+        def __init__(self) -> None:
+            super().__init__()
+            self.logs = logs
+
+        def getBindNames():
+            return {"aaa": "name for aaa"}
+
+        def getCallbacks():
+            def result__defer(result, logs):
+                logs.append("child defer " + str(result))
+
+        def getLoaders():
+            def result(aaa, logs):
+                logs.append("child " + str(aaa))
+                return aaa
+
+        def getRuleLists():
+            return {"aaa": {"properties": {"aaa": {"minimum": 0}}}}
+
+    class ParentService(Service):
+        def __init__(self) -> None:
+            super().__init__()
+            self.childService = ChildService
+            self.logs = logs
+
+        def getCallbacks():
+            def result__defer(logs):
+                logs.append("parent defer")
+
+        def getLoaders():
+            def result(childService, items):
+                for aaa in items:
+                    yield [childService, {"aaa": aaa}]
+
+    logs: List[str] = []
+
+    with ParentService.withLifecycleCallbacks(
+        onSuccess=lambda: logs.append("success"),
+        onFail=lambda: logs.append("fail"),
+    ):
+        bodies = [*ParentService().setWith({"items": [1, 2]}).iterRun()]
+
+        assert bodies == [{"result": 1}, {"result": 2}]
+        assert logs == [
+            "child 1",
+            "child 2",
+            "parent defer",
+            "child defer 1",
+            "child defer 2",
+            "success",
+        ]
+
+        logs.clear()
+        bodies = [*ParentService().setWith({"items": [1, -1]}).iterRun()]
+
+        assert bodies[0] == {"result": 1}
+        assert "aaa" in bodies[1]["errors"]
+        assert logs == ["child 1", "fail"]
+
+
+def test_lazy():
+    class Service1(Service):
+        def __init__(self) -> None:
+            super().__init__()
+            self.calls: List[str] = []
+
+        def getCallbacks():
+            def unused__cb1(unused, calls):
+                calls.append("unused__cb1")
+
+        def getLoaders():
+            def aaa(calls):
+                calls.append("aaa")
+                return "aaa value"
+
+            def unused(calls):
+                calls.append("unused")
+                return "unused value"
+
+            def result(aaa, calls):
+                calls.append("result")
+                return aaa
+
+    service1 = Service1().setWith()
+    service1.run()
+
+    assert sorted(service1.calls) == ["aaa", "result", "unused", "unused__cb1"]
+
+    service2 = Service1().setWith()
+    service2.setLazy()
+    response = service2.run()
+
+    assert response == {"result": "aaa value"}
+    assert service2.calls == ["aaa", "result"]
+    assert "unused" not in service2.getValidations()
+
+
+def test_load_data_from_input():
+
+    class ParentService(Service):
+        def getBindNames():
+            return {"result": "name for result"}
+
+        def getCallbacks():
+            pass
+
+        def getLoaders():
+            pass
+
+        def getRuleLists():
+            return {"result": {"required": ["result"]}}
+
+    service = ParentService().setWith({"result": "result value"})
+    service.run()
+
+    assert service.getTotalErrors() == {}
+
+
+def test_load_data_from_input_child_batch_service():
+    class ChildService(Service):
+        def getBindNames():
+            return {}
+
+        def getLoaders():
+            def result():
+                return "child result value"
+
+    class ParentService(Service):
+        def getBindNames():
+            return {
+                "result": "parent result name",
+            }
+
+        def getLoaders():
+            def result():
+                pass
+
+        def getRuleLists():
+            return {"result": {"required": ["result"]}}
+
+    service = ParentService().setWith(
+        {
+            "result": [
+                [ChildService],
+                [ChildService],
+            ]
+        }
+    )
+    service.run()
+
+    assert service.getTotalErrors() == {}
+    assert service.getData()["result"] == [
+        "child result value",
+        "child result value",
+    ]
+
+
+def test_load_data_from_input_service():
+    class ChildService(Service):
+        def getLoaders():
+            def result():
+                return "child result value"
+
+    class ParentService(Service):
+        def getBindNames():
+            return {
+                "result": "parent result name",
+            }
+
+        def getRuleLists():
+            return {"result": {"required": ["result"]}}
+
+    service = ParentService().setWith({"result": [ChildService]})
+    service.run()
+    value = service.getData()["result"]
+
+    assert value == "child result value"
+    assert service.getTotalErrors() == {}
+
+
+def test_load_data_from_loader():
+    class Service1(Service):
+        def getBindNames():
+            return {
+                "result": "name for result",
+            }
+
+        def getLoaders():
+            def result():
+                return "result value"
+
+        def getRuleLists():
+            return {
+                "result": {
+                    "required": ["result"],
+                    "properties": {"result": {"type": "string"}},
+                }
+            }
+
+    service1 = Service1().setWith()
+    service1.run()
+
+    assert service1.getTotalErrors() == {}
+
+    class Service2(Service):
+        def getBindNames():
+            return {
+                "result": "name for result",
+            }
+
+        def getLoaders():
+            def result():
+                return ["aaa", "bbb", "ccc"]
+
+        def getRuleLists():
+            return {
+                "result": {
+                    "required": ["result"],
+                    "properties": {"result": {"type": "string"}},
+                }
+            }
+
+    service2 = Service2().setWith()
+    service2.run()
+
+    assert service2.getTotalErrors() != {}
+
+
+def test_load_data_from_loader_with_default_value():
+    class Service1(Service):
+        def getBindNames():
+            return {}
+
+        def getLoaders():
+            def result(key1="abcd"):
+                return key1
+
+        def getRuleLists():
+            return {}
+
+    service1 = Service1().setWith()
+    service1.run()
+
+    assert service1.getTotalErrors() == {}
+    assert service1.getData()["result"] == "abcd"
+
+
+def test_load_data_from_loader_with_dependency():
+    class Service1(Service):
+        def getBindNames():
+            return {
+                "result": "name for result",
+            }
+
+        def getLoaders():
+            def aaa():
+                return "aaaaaa"
+
+            def result(aaa):
+                return aaa + " value"
+
+        def getRuleLists():
+            return {
+                "result": {
+                    "required": ["result"],
+                    "properties": {"result": {"type": "string"}},
+                }
+            }
+
+    service1 = Service1().setWith()
+    service1.run()
+
+    assert service1.getTotalErrors() == {}
+    assert service1.getData()["result"] == "aaaaaa value"
+
+
+def test_load_data_from_property():
+    class Service1(Service):
+        def __init__(self) -> None:
+            super().__init__()
+            self.key1: str = "aaa"
+
+        def getBindNames():
+            return {
+                "key1": "name for key1",
+                "result": "name for result",
+            }
+
+        def getLoaders():
+            def result(key1):
+                return key1
+
+        def getRuleLists():
+            return {
+                "result": {
+                    "required": ["result"],
+                    "properties": {"result": {"type": "string"}},
+                }
+            }
+
+    service1 = Service1().setWith()
+    service1.run()
+
+    assert service1.getTotalErrors() == {}
+
+    class Service2(Service):
+        def __init__(self) -> None:
+            super().__init__()
+            self.key1: List[str] = ["aaa", "bbb", "ccc"]
+
+        def getBindNames():
+            return {
+                "key1": "name for key1",
+                "result": "name for result",
+            }
+
+        def getLoaders():
+            def result(key1):
+                return key1
+
+        def getRuleLists():
+            return {
+                "result": {
+                    "required": ["result"],
+                    "properties": {"result": {"type": "string"}},
+                }
+            }
+
+    service2 = Service2().setWith()
+    service2.run()
+
+    assert service2.getTotalErrors() != {}
+
+
+def test_load_data_from_property_in_dependency():
+    class Service1(Service):
+        def __init__(self) -> None:
+            super().__init__()
+            self.aaa: str = "aaaaaa"
+
+        def getBindNames():
+            return {
+                "result": "name for result",
+            }
+
+        def getLoaders():
+            def result(aaa):
+                return aaa + " value"
+
+        def getRuleLists():
+            return {
+                "result": {
+                    "required": ["result"],
+                    "properties": {"result": {"type": "string"}},
+                }
+            }
+
+    service1 = Service1().setWith()
+    service1.run()
+
+    assert service1.getTotalErrors() == {}
+    assert service1.getData()["result"] == "aaaaaa value"
+
+
+def test_load_data_key_invaild_because_of_children_rule():
+    class Service1(Service):
+        def getBindNames():
+            return {
+                "result": "result[...] name",
+            }
+
+        def getLoaders():
+            def result():
+                return {
+                    "a": {
+                        "c": "ccc",
+                    },
+                    "b": {
+                        "c": "ccc",
+                    },
+                }
+
+        def getRuleLists():
+            return {
+                "result": {
+                    "properties": {
+                        "result": {
+                            "type": "object",
+                        }
+                    }
+                },
+                "result.a": {
+                    "properties": {
+                        "result": {
+                            "properties": {
+                                "a": {
+                                    "type": "string",
+                                }
+                            }
+                        }
+                    }
+                },
+                "result.b": {
+                    "properties": {
+                        "result": {
+                            "properties": {
+                                "b": {
+                                    "type": "object",
+                                }
+                            }
+                        }
+                    }
+                },
+            }
+
+    service1 = Service1().setWith()
+    service1.run()
+
+    assert service1.getValidations()["result"] == False
+
+
+def test_load_data_key_invaild_because_of_parent_rule():
+    class Service1(Service):
+        def getBindNames():
+            return {
+                "result": "result[...] name",
+            }
+
+        def getLoaders():
+            def result():
+                return {
+                    "a": {
+                        "c": "ccc",
+                    },
+                    "b": {
+                        "c": "ccc",
+                    },
+                }
+
+        def getRuleLists():
+            return {
+                "result": {
+                    "properties": {
+                        "result": {
+                            "type": "object",
+                        }
+                    }
+                },
+                "result.a": {
+                    "properties": {
+                        "result": {
+                            "properties": {
+                                "a": {
+                                    "type": "object",
+                                    "required": ["d"],
+                                }
+                            }
+                        }
+                    }
+                },
+                "result.a.c": {
+                    "properties": {
+                        "result": {
+                            "properties": {
+                                "a": {
+                                    "properties": {
+                                        "c": {
+                                            "type": "string",
+                                        }
+                                    },
+                                }
+                            }
+                        }
+                    }
+                },
+                "result.b": {
+                    "properties": {
+                        "result": {
+                            "properties": {
+                                "b": {
+                                    "type": "object",
+                                }
+                            }
+                        }
+                    }
+                },
+                "result.b.c": {
+                    "properties": {
+                        "result": {
+                            "properties": {
+                                "b": {
+                                    "properties": {
+                                        "c": {
+                                            "type": "string",
+                                        }
+                                    },
+                                }
+                            }
+                        }
+                    }
+                },
+            }
+
+    service1 = Service1().setWith()
+    service1.run()
+
+    assert service1.getValidations()["result"] == False
+    assert service1.getValidations()["result.a"] == False
+    assert service1.getValidations()["result.a.c"] == False
+    assert service1.getValidations()["result.b"] == True
+    assert service1.getValidations()["result.b.c"] == True
+
+
+def test_load_data_key_invaild_because_of_wildcard_rule():
+    class Service1(Service):
+        def getBindNames():
+            return {
+                "result": "result[...] name",
+            }
+
+        def getLoaders():
+            def result():
+                return {
+                    "a": {
+                        "c": 1,
+                    },
+                    "b": {
+                        "c": "ccc",
+                    },
+                }
+
+        def getRuleLists():
+            return {
+                "result": {
+                    "properties": {
+                        "result": {
+                            "type": "object",
+                        }
+                    }
+                },
+                "result.*": {
+                    "properties": {
+                        "result": {
+                            "additionalProperties": {
+                                "properties": {
+                                    "c": {
+                                        "type": "integer",
+                                    }
+                                },
+                            }
+                        }
+                    }
+                },
+            }
+
+    service1 = Service1().setWith()
+    service1.run()
+
+    assert service1.getValidations()["result"] == False
+    assert "result.a" in service1.getTotalErrors()
+
+
+def test_load_name():
+    class Service1(Service):
+        def getBindNames():
+            return {}
+
+        def getLoaders():
+            pass
+
+        def getRuleLists():
+            return {
+                "result": {
+                    "required": ["result"],
+                },
+            }
+
+    service = Service1().setWith({}, {"result": "result name"})
+    service.run()
+
+    assert service.getTotalErrors() != {}
+    assert "result name" in service.getTotalErrors()["result"][0]
+
+
+def test_load_name_bound():
+    class Service1(Service):
+        def getBindNames():
+            return {"result": "result name"}
+
+        def getLoaders():
+            pass
+
+        def getRuleLists():
+            return {
+                "result": {
+                    "required": ["result"],
+                },
+            }
+
+    service = Service1().setWith()
+    service.run()
+
+    assert service.getTotalErrors() != {}
+    assert "result name" in service.getTotalErrors()["result"][0]
+
+
+def test_load_name_bound_nested():
+    class Service1(Service):
+        def getBindNames():
+            return {}
+
+        def getLoaders():
+            pass
+
+        def getRuleLists():
+            return {
+                "result": {
+                    "required": ["result"],
+                },
+            }
+
+    service = Service1().setWith(
+        {}, {"result": "{{abcd}}", "aaa": "aaaa", "abcd": "{{aaa}} bbb ccc ddd"}
+    )
+    service.run()
+
+    assert service.getTotalErrors() != {}
+    assert "aaaa bbb ccc ddd" in service.getTotalErrors()["result"][0]
+
+
+def test_load_name_lazy():
+    resolved = []
+
+    class Service1(Service):
+        def getBindNames():
+            return {"price": "name for price"}
+
+        def getRuleLists():
+            return {"price": {"properties": {"price": {"required": ["amount"]}}}}
+
+        def resolveBindName(self, name):
+            resolved.append(name)
+            return super().resolveBindName(name)
+
+    service = Service1().setWith({"price": {"amount": 15}})
+    service.run()
+
+    assert service.getTotalErrors() == {}
+    assert resolved == []
+
+    service = Service1().setWith({"price": {}})
+    service.run()
+
+    assert service.getTotalErrors()["price"] == ["'name for price' is required"]
+    assert resolved == ["{{price}}"]
+
+    class ChildService(Service):
+        POOL_SIZE = 1
+
+        def getBindNames():
+            return {}
+
+        def getRuleLists():
+            return {"price": {"properties": {"price": {"required": ["amount"]}}}}
+
+    class ParentService(Service):
+        MAX_CHILDS_IN_FLIGHT = 1
+
+        def __init__(self) -> None:
+            super().__init__()
+            self.childService = ChildService
+
+        def getBindNames():
+            return {"result": "name for result"}
+
+        def getLoaders():
+            def result(childService):
+                return [[childService, {"price": {}}, {"price": "name for child"}]]
+
+    service = ParentService().setWith()
+    service.run()
+
+    assert service.getTotalErrors() == {
+        "result.0": {"price": ["'name for child' is required"]}
+    }
+
+
+def test_load_name_multidimension():
+    class Service1(Service):
+        def getBindNames():
+            return {}
+
+        def getLoaders():
+            pass
+
+        def getRuleLists():
+            return {
+                "result": {
+                    "properties": {
+                        "result": {
+                            "properties": {
+                                "a": {
+                                    "required": ["b"],
+                                }
+                            },
+                        },
+                    },
+                },
+            }
+
+    service = Service1().setWith(
+        {"result": {"a": {}}},
+        {"result": "result[...] name"},
+    )
+    service.run()
+
+    assert service.getTotalErrors() != {}
+    assert "result" in service.getTotalErrors()
+    assert len(service.getTotalErrors()["result"]) == 1
+    assert "result[a][b]" in service.getTotalErrors()["result"][0]
+
+
+def test_response_body_writer():
+    import io
+
+    class ChildService(Service):
+        def getBindNames():
+            return {"aaa": "name for aaa"}
+
+        def getLoaders():
+            def result(aaa):
+                return {"value": aaa * 10}
+
+        def getRuleLists():
+            return {"aaa": {"properties": {"aaa": {"minimum": 1}}}}
+
+    class ParentService(Service):
+        def __init__(self) -> None:
+            super().__init__()
+            self.childService = ChildService
+
+        def getLoaders():
+            def result(childService, size):
+                for i in range(size):
+                    yield [childService, {"aaa": i + 1}]
+
+    chunks = [*ParentService().setWith({"size": 3}).iterResponseBody()]
+
+    assert len(chunks) > 3
+    assert json.loads("".join(chunks)) == {
+        "result": [{"value": 10}, {"value": 20}, {"value": 30}]
+    }
+    assert "".join(chunks) == json.dumps(
+        {"result": [{"value": 10}, {"value": 20}, {"value": 30}]}
+    )
+
+    class FailingParentService(ParentService):
+        def getLoaders():
+            def result(childService):
+                for i in range(3):
+                    yield [childService, {"aaa": i}]
+
+    fp = io.StringIO()
+    FailingParentService().setWith().writeResponseBody(fp)
+    body = json.loads(fp.getvalue())
+
+    assert body["result"] == [{"value": 10}, {"value": 20}]
+    assert [*body["errors"].keys()] == ["result.0"]
+
+    fp = io.StringIO()
+    ChildService().setWith({"aaa": 2}).writeResponseBody(fp)
+
+    assert json.loads(fp.getvalue()) == {"result": {"value": 20}}
+
+    class LinesParentService(ParentService):
+        @staticmethod
+        def iterStreamedResponseBody(results, getTotalErrors):
+            for result in results:
+                yield json.dumps(result) + "\n"
+
+            yield json.dumps({"errors": getTotalErrors()}) + "\n"
+
+    chunks = [*LinesParentService().setWith({"size": 2}).iterResponseBody()]
+
+    assert chunks == ['{"value": 10}\n', '{"value": 20}\n', '{"errors": {}}\n']
+    assert "iterStreamedResponseBody" not in ServiceBase.__abstractmethods__
+
+
+def test_result_cache():
+    class Service1(Service):
+        def __init__(self) -> None:
+            super().__init__()
+            self.calls: List[str] = []
+
+        def getLoaders():
+            def result(aaa, calls):
+                calls.append("result")
+                return aaa
+
+    class Service2(Service):
+        def getCallbacks():
+            def result__cb1(result):
+                pass
+
+        def getLoaders():
+            def result(aaa):
+                return aaa
+
+    resultCache = ResultCache(maxSize=1)
+    Service1.setResultCache(resultCache)
+    Service2.setResultCache(resultCache)
+
+    service1 = Service1().setWith({"aaa": "aaa value"})
+    service2 = Service1().setWith({"aaa": "aaa value"})
+
+    assert service1.run() == {"result": "aaa value"}
+    assert service2.run() == {"result": "aaa value"}
+    assert service1.calls == ["result"]
+    assert service2.calls == []
+    assert resultCache.size() == 1
+
+    service3 = Service1().setWith({"aaa": "bbb value"})
+
+    assert service3.run() == {"result": "bbb value"}
+    assert service3.calls == ["result"]
+    assert resultCache.size() == 1
+
+    assert Service2.getResultCache() is None
+
+    class StreamService(Service):
+        def __init__(self) -> None:
+            super().__init__()
+            self.childService = Service1
+
+        def getLoaders():
+            def result(childService, size):
+                return [[childService, {"aaa": i}] for i in range(size)]
+
+    StreamService.setResultCache(resultCache)
+
+    assert StreamService().setWith({"size": 2}).run() == {"result": [0, 1]}
+    assert [*StreamService().setWith({"size": 2}).iterRun()] == [
+        {"result": 0},
+        {"result": 1},
+    ]
+
+    class ChildService(Service):
+        def __init__(self) -> None:
+            super().__init__()
+            self.calls = calls
+
+        def getCallbacks():
+            def result__defer(result, calls):
+                calls.append(result)
+
+        def getLoaders():
+            def result(aaa):
+                return aaa
+
+    class ParentService(Service):
+        def __init__(self) -> None:
+            super().__init__()
+            self.childService = ChildService
+
+        def getLoaders():
+            def result(childService, aaa):
+                return [[childService, {"aaa": aaa}]]
+
+    calls: List[str] = []
+    resultCache = ResultCache(maxSize=2)
+    ParentService.setResultCache(resultCache)
+
+    assert [*ParentService().setWith({"aaa": 1}).iterRun()] == [{"result": 1}]
+    assert ParentService().setWith({"aaa": 1}).run() == {"result": [1]}
+    assert ParentService().setWith({"aaa": 1}).run() == {"result": [1]}
+    assert calls == [1, 1, 1]
+    assert resultCache.size() == 0
+
+
+def test_rerun():
+    class Service1(Service):
+        def __init__(self) -> None:
+            super().__init__()
+            self.calls: List[str] = []
+
+        def getBindNames():
+            return {"aaa": "name for aaa", "bbb": "name for bbb"}
+
+        def getLoaders():
+            def aaa2(aaa, calls):
+                calls.append("aaa2")
+                return aaa * 2
+
+            def bbb2(bbb, calls):
+                calls.append("bbb2")
+                return bbb * 2
+
+            def result(aaa2, bbb2):
+                return aaa2 + bbb2
+
+        def getRuleLists():
+            return {"aaa": {"properties": {"aaa": {"minimum": 1}}}}
+
+    service = Service1().setWith({"aaa": 1, "bbb": 2})
+
+    assert service.run() == {"result": 6}
+    assert sorted(service.calls) == ["aaa2", "bbb2"]
+
+    service.update({"aaa": 3})
+
+    assert service.rerun() == {"result": 10}
+    assert sorted(service.calls) == ["aaa2", "aaa2", "bbb2"]
+
+    service.update({"aaa": 0})
+
+    assert "aaa" in service.rerun()["errors"]
+
+    service.update({"aaa": 1})
+
+    assert service.rerun() == {"result": 6}
+    assert service.getErrors() == {}
+    assert service.getTotalErrors() == {}
+    assert not service.hasTotalErrors()
+
+
+def test_rerun_after_abort():
+    class Service1(Service):
+        def getBindNames():
+            return {"aaa": "name for aaa", "bbb": "name for bbb"}
+
+        def getLoaders():
+            def result(aaa, bbb):
+                return aaa + bbb
+
+        def getRuleLists():
+            return {
+                "aaa": {"properties": {"aaa": {"minimum": 1}}},
+                "bbb": {"properties": {"bbb": {"minimum": 1}}},
             }
 
+    service = Service1().setWith({"aaa": 0, "bbb": 2})
+    service.setFailFast()
+
+    assert [*service.run()["errors"].keys()] == ["aaa"]
+
+    service.update({"aaa": 3})
+
+    assert service.rerun() == {"result": 5}
+    assert service.getValidations()["bbb"]
+
+
+def test_rerun_callbacks():
+    class Service1(Service):
+        def __init__(self) -> None:
+            super().__init__()
+            self.logs = logs
+
+        def getCallbacks():
+            def aaa__log__defer(aaa, logs):
+                logs.append("aaa defer " + str(aaa))
+
+            def bbb__log__defer(bbb, logs):
+                logs.append("bbb defer " + str(bbb))
+
+        def getLoaders():
+            def result(aaa, bbb):
+                return aaa + bbb
+
+    logs: List[str] = []
+    service = Service1().setWith({"aaa": 1, "bbb": 2})
+
+    with Service1.withLifecycleCallbacks(
+        onStart=lambda: logs.append("start"),
+        onSuccess=lambda: logs.append("success"),
+    ):
+        assert service.run() == {"result": 3}
+        assert logs == ["start", "aaa defer 1", "bbb defer 2", "success"]
+
+        logs.clear()
+        service.update({"aaa": 5})
+
+        assert service.rerun() == {"result": 7}
+        assert logs == ["start", "aaa defer 5", "success"]
+
+
+def test_loaders_compiled_once():
+    class Service1(Service):
+        def __init__(self) -> None:
+            super().__init__()
+            self.key1 = "aaa"
+
+        def getLoaders():
+            def result(key1, key2="bbb"):
+                return key1 + key2
+
+    loader = Service1.getAllLoaders()["result"]
+    binder = getBinder(loader)
+
+    assert Service1.getAllLoaders()["result"] is loader
+    assert getBinder(loader) is binder
+    assert binder.names == ("key1", "key2")
+    assert binder.defaults == {"key2": "bbb"}
+    assert Service1().setWith().run() == {"result": "aaabbb"}
+
+    import gc
+    import weakref
+
+    def func(aaa):
+        return aaa
+
+    getBinder(func)
+    ref = weakref.ref(func)
+    del func
+    gc.collect()
+
+    assert ref() is None
+
+
+def test_memory_profiler():
+    class ChildService(Service):
+        def getLoaders():
+            def result():
+                return len([0] * 100000)
+
+    class ParentService(Service):
+        def getLoaders():
+            def items():
+                return [0] * 200000
+
+            def result(items):
+                return len(items)
+
+    profiler = MemoryProfiler()
+    service = ParentService().setWith({"child": [ChildService]})
+    response = profiler.profile(service)
+    report = profiler.getReport()
+    tree = report["tree"][0]
+    nodes = {x["kind"] + " " + x["name"]: x for x in tree["childs"]}
+
+    assert response == {"result": 200000}
+    assert tree["kind"] == "service"
+    assert nodes["loader items"]["net"] >= sys.getsizeof([0] * 200000) - 1024
+    assert nodes["child child"]["peak"] >= sys.getsizeof([0] * 100000)
+    assert nodes["child child"]["childs"][0]["name"] == "ChildService"
+    assert "child items" not in nodes
+    assert report["topSites"]
+    assert "loader items" in profiler.formatReport()
+
+    class PooledService(Service):
+        POOL_SIZE = 1
+
+        def getLoaders():
+            def result():
+                return "result value"
+
+    profiler = MemoryProfiler()
+    service = ParentService().setWith({"child": [PooledService]})
+    profiler.profile(service)
+    service.release()
+    ParentService().setWith({"child": [PooledService]}).run()
+
+    assert len(profiler.getReport()["tree"]) == 1
+
+
+def test_retried_loader():
+    class FakeBackend:
+        def __init__(self, failures: int) -> None:
+            self.failures = failures
+
+        def fetch(self):
+            if self.failures:
+                self.failures -= 1
+                raise ConnectionError("backend unavailable")
+            return "backend value"
+
+    class Service1(Service):
+        def __init__(self) -> None:
+            super().__init__()
+            self.backend = FakeBackend(2)
+
+        def getBindNames():
+            return {}
+
+        def getLoaderOptions():
+            return {"result": {"idempotent": True, "retries": 2, "backoff": 0.001}}
+
+        def getLoaders():
+            def result(backend):
+                return backend.fetch()
+
+    service = Service1()
+    service.run()
+
+    assert service.getData()["result"] == "backend value"
+    assert service.getLoaderStats()["result"]["attempts"] == 3
+    assert len(service.getLoaderStats()["result"]["latencies"]) == 3
+
+    service = Service1()
+    service.backend = FakeBackend(3)
+
+    try:
+        service.run()
+        assert False
+    except ConnectionError:
+        pass
+
+
+def test_reset_and_pool():
+    class ChildService(Service):
+        POOL_SIZE = 2
+        instances: List[Service] = []
+
+        def __init__(self) -> None:
+            super().__init__()
+            type(self).instances.append(self)
+
+        def getLoaders():
+            def result(aaa):
+                return aaa
+
+    class ParentService(Service):
+        def __init__(self) -> None:
+            super().__init__()
+            self.key1 = "aaa"
+
+        def getLoaders():
+            def result(items, key1):
+                return items
+
+    service = ParentService().setWith(
+        {"items": [[ChildService, {"aaa": 1}], [ChildService, {"aaa": 2}]]}
+    )
+
+    assert service.run() == {"result": [1, 2]}
+    assert len(ChildService.instances) == 2
+
+    service.reset()
+
+    assert service.key1 == "aaa"
+    assert service.getData() == {}
+    assert service.getInputs() == {}
+
+    service = service.setWith(
+        {"items": [[ChildService, {"aaa": 3}], [ChildService, {"aaa": 4}]]}
+    )
+
+    assert service.run() == {"result": [3, 4]}
+    assert len(ChildService.instances) == 2
+
+    service.reset()
+    pooled = [ChildService.acquire(), ChildService.acquire()]
+
+    assert all(any(x is y for y in ChildService.instances) for x in pooled)
+
+
+def test_rule_with_dependency():
+    class Service1(Service):
+        def getBindNames():
+            return {"minPrice": "name for minPrice", "price": "name for price"}
+
         def getLoaders():
-            def result():
-                return {
-                    "a": {
-                        "c": "ccc",
-                    },
-                    "b": {
-                        "c": "ccc",
-                    },
-                }
+            def minPrice():
+                return 10
 
         def getRuleLists():
             return {
-                "result": {
-                    "properties": {
-                        "result": {
-                            "type": "object",
-                        }
-                    }
-                },
-                "result.a": {
-                    "properties": {
-                        "result": {
-                            "properties": {
-                                "a": {
-                                    "type": "string",
-                                }
-                            }
-                        }
-                    }
-                },
-                "result.b": {
+                "price": {
                     "properties": {
-                        "result": {
-                            "properties": {
-                                "b": {
-                                    "type": "object",
-                                }
-                            }
+                        "price": {
+                            "type": "number",
+                            "minimum": "{{minPrice}}",
+                            "description": "at least {{minPrice}}",
                         }
                     }
-                },
+                }
             }
 
-    service1 = Service1().setWith()
-    service1.run()
+    service = Service1().setWith({"price": 5})
+    service.run()
 
-    assert service1.getValidations()["result"] == False
+    assert service.getStructuredErrors()["price"][0].keyword == "minimum"
 
+    service = Service1().setWith({"price": 15})
+    service.run()
 
-def test_load_data_key_invaild_because_of_parent_rule():
-    class Service1(Service):
+    assert service.getTotalErrors() == {}
+    assert service.getData()["price"] == 15
+
+    class LegacyService(Service):
         def getBindNames():
-            return {
-                "result": "result[...] name",
-            }
+            return {"price": "name for price"}
+
+        @staticmethod
+        def getValidationErrors(data, ruleLists, names, messages):
+            return Service.getValidationErrors(data, ruleLists, names, messages)
+
+        def getRuleLists():
+            return {"price": {"properties": {"price": {"minimum": 10}}}}
+
+    service = LegacyService().setWith({"price": 5})
+    service.run()
+
+    assert service.getStructuredErrors()["price"][0].keyword == "minimum"
 
-        def getLoaders():
-            def result():
-                return {
-                    "a": {
-                        "c": "ccc",
-                    },
-                    "b": {
-                        "c": "ccc",
-                    },
-                }
+
+def test_structured_errors():
+    class Service1(Service):
+        def getBindNames():
+            return {"result": "result[...] name"}
 
         def getRuleLists():
             return {
                 "result": {
-                    "properties": {
-                        "result": {
-                            "type": "object",
-                        }
-                    }
-                },
-                "result.a": {
-                    "properties": {
-                        "result": {
-                            "properties": {
-                                "a": {
-                                    "type": "object",
-                                    "required": ["d"],
-                                }
-                            }
-                        }
-                    }
-                },
-                "result.a.c": {
                     "properties": {
                         "result": {
                             "properties": {
                                 "a": {
-                                    "properties": {
-                                        "c": {
-                                            "type": "string",
-                                        }
-                                    },
-                                }
-                            }
-                        }
-                    }
-                },
-                "result.b": {
-                    "properties": {
-                        "result": {
-                            "properties": {
-                                "b": {
-                                    "type": "object",
-                                }
-                            }
-                        }
-                    }
-                },
-                "result.b.c": {
-                    "properties": {
-                        "result": {
-                            "properties": {
-                                "b": {
-                                    "properties": {
-                                        "c": {
-                                            "type": "string",
-                                        }
-                                    },
+                                    "required": ["b"],
                                 }
-                            }
-                        }
-                    }
+                            },
+                        },
+                    },
                 },
             }
 
-    service1 = Service1().setWith()
-    service1.run()
+    service = Service1().setWith({"result": {"a": {}}})
+    service.run()
 
-    assert service1.getValidations()["result"] == False
-    assert service1.getValidations()["result.a"] == False
-    assert service1.getValidations()["result.a.c"] == False
-    assert service1.getValidations()["result.b"] == True
-    assert service1.getValidations()["result.b.c"] == True
+    assert service.hasTotalErrors()
 
+    error = service.getStructuredErrors()["result"][0]
 
-def test_load_name():
+    assert error.keyword == "required"
+    assert error.path == ["result", "a"]
+    assert error.key == "result"
+    assert error.getName() == "result[a][b] name"
+    assert service.getErrors()["result"][0] == "'result[a][b] name' is required"
+
+
+def test_validate_keys():
     class Service1(Service):
+        def __init__(self) -> None:
+            super().__init__()
+            self.calls: List[str] = []
+
         def getBindNames():
-            return {}
+            return {"aaa": "name for aaa", "bbb": "name for bbb"}
 
         def getLoaders():
-            pass
+            def bbb(calls):
+                calls.append("bbb")
+                return 0
+
+            def result(calls):
+                calls.append("result")
+                return "result value"
 
         def getRuleLists():
             return {
-                "result": {
-                    "required": ["result"],
-                },
+                "aaa": {"properties": {"aaa": {"minimum": 1}}},
+                "bbb": {"properties": {"bbb": {"minimum": 1}}},
             }
 
-    service = Service1().setWith({}, {"result": "result name"})
-    service.run()
+    service = Service1().setWith({"aaa": 0})
+    errors = service.validateKeys(["aaa"])
 
-    assert service.getTotalErrors() != {}
-    assert "result name" in service.getTotalErrors()["result"][0]
+    assert [*errors.keys()] == ["aaa"]
+    assert service.calls == []
 
+    errors = service.validateKeys(["bbb"])
 
-def test_load_name_bound():
+    assert [*errors.keys()] == ["bbb"]
+    assert service.calls == ["bbb"]
+
+
+def test_timeout():
     class Service1(Service):
+        def __init__(self) -> None:
+            super().__init__()
+            self.calls: List[str] = []
+
         def getBindNames():
-            return {"result": "result name"}
+            return {"aaa": "{{bbb}} for aaa", "bbb": "name"}
+
+        def getLoaderOptions():
+            return {"aaa": {"timeout": 0.05}}
 
         def getLoaders():
-            pass
+            def aaa():
+                import time
 
-        def getRuleLists():
-            return {
-                "result": {
-                    "required": ["result"],
-                },
-            }
+                time.sleep(0.5)
+                return "aaa value"
 
-    service = Service1().setWith()
+            def result(aaa, calls):
+                calls.append("result")
+                return aaa
+
+    service = Service1()
     service.run()
 
-    assert service.getTotalErrors() != {}
-    assert "result name" in service.getTotalErrors()["result"][0]
+    assert service.getErrors() == {"aaa": ["'name for aaa' is timed out"]}
+    assert service.getStructuredErrors()["aaa"][0].keyword == "timeout"
+    assert service.calls == []
 
 
-def test_load_name_bound_nested():
+def test_timeout_context():
+    from contextvars import ContextVar
+
+    var: ContextVar = ContextVar("var")
+
+    class Service1(Service):
+        def __init__(self) -> None:
+            super().__init__()
+            self.var = var
+
+        def getLoaderOptions():
+            return {"result": {"timeout": 1}}
+
+        def getLoaders():
+            def result(var):
+                return var.get("unset")
+
+    token = var.set("caller value")
+
+    try:
+        assert Service1().setWith().run() == {"result": "caller value"}
+    finally:
+        var.reset(token)
+
+
+def test_timeout_rerun():
     class Service1(Service):
+        def getLoaderOptions():
+            return {"aaa": {"timeout": 0.1}}
+
+        def getLoaders():
+            def aaa(delay):
+                import time
+
+                time.sleep(delay)
+                return "aaa value"
+
+            def result(aaa):
+                return aaa
+
+    service = Service1().setWith({"delay": 0.5})
+
+    assert "aaa" in service.run()["errors"]
+
+    service.update({"delay": 0})
+
+    assert service.rerun() == {"result": "aaa value"}
+
+
+def test_total_errors():
+    class ChildService(Service):
         def getBindNames():
-            return {}
+            return {"aaa": "name for aaa"}
 
         def getLoaders():
-            pass
+            def result(aaa):
+                return aaa
 
         def getRuleLists():
-            return {
-                "result": {
-                    "required": ["result"],
-                },
-            }
+            return {"aaa": {"required": ["aaa"]}}
 
-    service = Service1().setWith(
-        {}, {"result": "{{abcd}}", "aaa": "aaaa", "abcd": "{{aaa}} bbb ccc ddd"}
-    )
+    class ParentService(Service):
+        def __init__(self) -> None:
+            super().__init__()
+            self.childService = ChildService
+
+        def getBindNames():
+            return {"bbb": "name for bbb", "ccc": "name for ccc"}
+
+        def getLoaders():
+            def ccc(childService):
+                return [childService]
+
+            def result(childService):
+                return [[childService, {"aaa": 1}], [childService]]
+
+        def getRuleLists():
+            return {"bbb": {"required": ["bbb"]}}
+
+    service = ParentService().setWith()
     service.run()
 
-    assert service.getTotalErrors() != {}
-    assert "aaaa bbb ccc ddd" in service.getTotalErrors()["result"][0]
+    assert service.getTotalErrors() == {
+        "bbb": ["'name for bbb' is required"],
+        "ccc": {"aaa": ["'name for aaa' is required"]},
+        "result.1": {"aaa": ["'name for aaa' is required"]},
+    }
 
+    service.getTotalErrors()["ccc"]["aaa"].append("appended")
+    service.getTotalErrors()["result.1"]["bbb"] = []
 
-def test_load_name_multidimension():
-    class Service1(Service):
+    assert service.getTotalErrors()["ccc"] == {"aaa": ["'name for aaa' is required"]}
+    assert service.getTotalErrors()["result.1"] == {
+        "aaa": ["'name for aaa' is required"]
+    }
+
+
+def test_traits():
+    class Trait1(Service):
         def getBindNames():
-            return {}
+            return {"aaa": "name for aaa"}
 
         def getLoaders():
-            pass
+            def aaa():
+                return "aaa value"
 
-        def getRuleLists():
-            return {
-                "result": {
-                    "properties": {
-                        "result": {
-                            "properties": {
-                                "a": {
-                                    "required": ["b"],
-                                }
-                            },
-                        },
-                    },
-                },
-            }
+    class Trait2(Service):
+        def getTraits():
+            return [Trait1]
 
-    service = Service1().setWith(
-        {"result": {"a": {}}},
-        {"result": "result[...] name"},
-    )
-    service.run()
+        def getLoaders():
+            def bbb(aaa):
+                return aaa + " bbb"
 
-    assert service.getTotalErrors() != {}
-    assert "result" in service.getTotalErrors()
-    assert len(service.getTotalErrors()["result"]) == 1
-    assert "result[a][b]" in service.getTotalErrors()["result"][0]
+    class Service1(Service):
+        def getTraits():
+            return [Trait2, Trait1]
+
+        def getLoaders():
+            def result(bbb):
+                return bbb
+
+    assert Service1.getAllTraits() == [Trait1, Trait2]
+    assert Service1.getAllTraits() == [Trait1, Trait2]
+    assert Service.isServiceClass(Service1)
+    assert not Service.isServiceClass(object)
+
+    service = Service1().setWith()
+
+    assert service.run() == {"result": "aaa value bbb"}